@@ -0,0 +1,75 @@
+"""Add full-text search indexes
+
+Revision ID: 5d2c8e41a7f3
+Revises: 0871b70bccf8
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2c8e41a7f3'
+down_revision: Union[str, None] = '0871b70bccf8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Searchable columns and text search configuration per table, as of this
+# revision. The Postgres expressions must stay identical to the ones
+# app/search.py queries with, or the indexes are not used.
+SEARCH_TABLES = {
+    'cases': (['title', 'case_number', 'description'], 'english'),
+    'clients': (['name', 'email', 'phone'], 'simple'),
+    'companies': (['name', 'company_type'], 'simple'),
+    'notes': (['content'], 'english'),
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table, (columns, config) in SEARCH_TABLES.items():
+        if dialect == 'postgresql':
+            # GIN index over the tsvector expression
+            document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_search "
+                f"ON {table} USING gin (to_tsvector('{config}', {document}))"
+            )
+        elif dialect == 'sqlite':
+            # External-content FTS5 table kept in sync by triggers
+            fts = f"{table}_fts"
+            names = ", ".join(columns)
+            new_values = ", ".join(f"new.{column}" for column in columns)
+            old_values = ", ".join(f"old.{column}" for column in columns)
+            op.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"{names}, content='{table}', content_rowid='id', prefix='2 3')"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END"
+            )
+            # Index rows that existed before the table was created
+            op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table in SEARCH_TABLES:
+        if dialect == 'postgresql':
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search")
+        elif dialect == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
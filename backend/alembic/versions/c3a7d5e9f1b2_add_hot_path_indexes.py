@@ -0,0 +1,59 @@
+"""Add indexes for hot list and access-check filters
+
+Revision ID: c3a7d5e9f1b2
+Revises: 9b4e1f6c2d80
+Create Date: 2026-10-17 14:26:09.381742
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a7d5e9f1b2'
+down_revision: Union[str, None] = '9b4e1f6c2d80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, unique)
+INDEXES = [
+    ('ix_tasks_assignee_status_due', 'tasks', ['assignee_id', 'status', 'due_date'], False),
+    ('ix_tasks_case_id', 'tasks', ['case_id'], False),
+    ('ix_case_assistants_assistant_case', 'case_assistants', ['assistant_id', 'case_id'], True),
+    ('ix_documents_case_id', 'documents', ['case_id'], False),
+    ('ix_notes_case_pinned_created', 'notes', ['case_id', 'is_pinned', 'created_at'], False),
+    ('ix_cases_attorney_status', 'cases', ['primary_attorney_id', 'status'], False),
+]
+
+
+def upgrade() -> None:
+    # The unique index would fail on duplicate assignments; keep the first of each
+    op.execute(
+        "DELETE FROM case_assistants WHERE id NOT IN ("
+        "SELECT min(id) FROM case_assistants GROUP BY case_id, assistant_id)"
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # CONCURRENTLY builds without blocking writes but can't run inside a
+        # transaction. A failed concurrent build leaves an INVALID index, so
+        # drop any leftover first to make the migration re-runnable.
+        with op.get_context().autocommit_block():
+            for name, table, columns, unique in INDEXES:
+                op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+                op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True)
+    else:
+        for name, table, columns, unique in INDEXES:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, _, _ in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    else:
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table)
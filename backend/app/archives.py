@@ -0,0 +1,93 @@
+import zipfile
+from datetime import datetime
+from pathlib import PurePath
+from typing import Iterable, Iterator, NamedTuple, Optional, Set
+from app.storage import storage_for
+
+CHUNK_SIZE = 256 * 1024
+
+# Formats that are already compressed; deflating them again costs CPU for
+# no gain, so they are stored as-is
+STORED_TYPES = {
+    "pdf", "jpg", "jpeg", "png", "gif", "webp", "heic", "tif", "tiff",
+    "zip", "7z", "gz", "rar", "mp3", "m4a", "mp4", "mov", "avi",
+    "docx", "xlsx", "pptx", "odt", "ods",
+}
+
+class ArchiveEntry(NamedTuple):
+    name: str
+    locator: str
+    file_type: Optional[str]
+    file_size: Optional[int]
+    modified: Optional[datetime]
+
+class _ZipSink:
+    """Write-only buffer ZipFile writes into; drained after every write.
+
+    It has no tell()/seek(), so ZipFile writes sizes and CRCs in data
+    descriptors after each member instead of seeking back.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def unique_name(name: str, used: Set[str]) -> str:
+    """Flatten `name` into a single path component not already in `used`"""
+    name = name.replace("/", "_").replace("\\", "_").strip() or "document"
+    candidate, counter = name, 1
+    path = PurePath(name)
+    while candidate.lower() in used:
+        counter += 1
+        candidate = f"{path.stem} ({counter}){path.suffix}"
+    used.add(candidate.lower())
+    return candidate
+
+def zip_stream(entries: Iterable[ArchiveEntry]) -> Iterator[bytes]:
+    """Build a ZIP on the fly, yielding it piece by piece.
+
+    Memory stays at roughly one read chunk regardless of the archive size;
+    files whose content is missing from storage are left out.
+    """
+    sink = _ZipSink()
+    used: Set[str] = set()
+    with zipfile.ZipFile(sink, "w", allowZip64=True) as archive:
+        for entry in entries:
+            backend = storage_for(entry.locator)
+            if not backend.exists(entry.locator):
+                continue
+            modified = entry.modified or datetime(1980, 1, 1)
+            info = zipfile.ZipInfo(unique_name(entry.name, used), date_time=modified.timetuple()[:6])
+            if (entry.file_type or "").lower() in STORED_TYPES:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+            if entry.file_size is not None:
+                info.file_size = entry.file_size  # lets ZipFile pick zip64 up front
+            with backend.open(entry.locator) as source, archive.open(info, "w") as member:
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    member.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    # Central directory
+    data = sink.drain()
+    if data:
+        yield data
@@ -1,12 +1,13 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app import models, schemas
+from app import models, schemas, passwords
+from app.cache import TTLCache
 import os
 from dotenv import load_dotenv
 
@@ -15,15 +16,39 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "5"))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "1024"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+# Resolved principals keyed by token subject (email). Entries are column
+# snapshots rather than ORM instances, so they never outlive their session.
+#
+# The cache is per worker process and only the process that changes a user
+# invalidates its entry. On the others a deactivated user keeps access, and a
+# changed role keeps its old permissions, for up to AUTH_CACHE_TTL_SECONDS;
+# keep it short (5s by default). 0 disables the cache, so every request
+# re-reads the user.
+principal_cache = TTLCache("principals", maxsize=AUTH_CACHE_MAX_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+_PRINCIPAL_COLUMNS = [attr.key for attr in inspect(models.User).column_attrs if attr.key != "hashed_password"]
+
+def invalidate_principal(email: Optional[str]):
+    """Drop a cached principal; call whenever a user row changes"""
+    if email:
+        principal_cache.invalidate(email)
+
+# Password work runs in the bounded pool in app.passwords, never on the caller's thread
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return passwords.verify_password(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return passwords.hash_password(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await passwords.verify_password_async(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await passwords.hash_password_async(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -48,9 +73,15 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.email == email).first()
-    if user is None:
-        raise credentials_exception
+    snapshot = principal_cache.get(email)
+    if snapshot is not None:
+        # Detached copy: handlers only read the principal's columns
+        user = models.User(**snapshot)
+    else:
+        user = db.query(models.User).filter(models.User.email == email).first()
+        if user is None:
+            raise credentials_exception
+        principal_cache.set(email, {key: getattr(user, key) for key in _PRINCIPAL_COLUMNS})
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
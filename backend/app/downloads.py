@@ -0,0 +1,228 @@
+import mimetypes
+import os
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from dotenv import load_dotenv
+from app import models
+from app.storage import UPLOAD_DIR
+
+load_dotenv()
+
+CHUNK_SIZE = 256 * 1024
+MAX_RANGES = 16
+
+# Hand the file transfer to the reverse proxy instead of a Python worker:
+#   "x-accel-redirect" (nginx): internal redirect to DOWNLOAD_OFFLOAD_PREFIX +
+#       the path relative to UPLOAD_DIR, e.g. an `internal` location
+#       `location /protected/ { internal; alias /srv/casepilot/uploads/; }`
+#   "x-sendfile" (Apache mod_xsendfile, lighttpd): absolute file path
+# Empty (the default) streams the file from the worker. Only files under
+# UPLOAD_DIR are offloaded; anything else is streamed.
+DOWNLOAD_OFFLOAD_MODES = ("x-accel-redirect", "x-sendfile")
+DOWNLOAD_OFFLOAD = os.getenv("DOWNLOAD_OFFLOAD", "").strip().lower()
+DOWNLOAD_OFFLOAD_PREFIX = os.getenv("DOWNLOAD_OFFLOAD_PREFIX", "/protected/")
+
+if DOWNLOAD_OFFLOAD and DOWNLOAD_OFFLOAD not in DOWNLOAD_OFFLOAD_MODES:
+    raise RuntimeError(f"Unknown DOWNLOAD_OFFLOAD mode: {DOWNLOAD_OFFLOAD}")
+
+def media_type_for(file_type: Optional[str]) -> str:
+    """MIME type for a Document.file_type extension such as "pdf" """
+    if file_type:
+        guessed = mimetypes.types_map.get("." + file_type.lower())
+        if guessed:
+            return guessed
+    return "application/octet-stream"
+
+def document_etag(document: models.Document) -> str:
+    # Stored files are never modified in place, so the digest (or, for files
+    # uploaded before digests were recorded, id + size + upload time) is a
+    # strong validator
+    if document.sha256:
+        return f'"{document.sha256}"'
+    uploaded = int(document.uploaded_at.timestamp()) if document.uploaded_at else 0
+    return f'"d{document.id}-{document.file_size or 0}-{uploaded}"'
+
+def content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+def _etag_matches(header: str, etag: str, weak: bool) -> bool:
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def parse_range(header: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """Parse a "bytes=" Range header into inclusive (start, end) pairs.
+
+    Returns None when the header is malformed (it is then ignored, per
+    RFC 9110) and an empty list when no range is satisfiable.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+    ranges = []
+    for part in spec.split(",")[:MAX_RANGES]:
+        start_text, dash, end_text = part.strip().partition("-")
+        if not dash:
+            return None
+        try:
+            if start_text:
+                start = int(start_text)
+                end = int(end_text) if end_text else size - 1
+            else:
+                # Suffix range: the last N bytes
+                length = int(end_text)
+                if length == 0:
+                    continue
+                start, end = max(size - length, 0), size - 1
+        except ValueError:
+            return None
+        if start >= size:
+            continue  # unsatisfiable
+        if start < 0 or end < start:
+            return None
+        ranges.append((start, min(end, size - 1)))
+    return ranges
+
+def offload_headers(path: str) -> Optional[Dict[str, str]]:
+    """Internal-redirect header telling the proxy which file to send, or None
+    when the file is outside UPLOAD_DIR and must be streamed instead"""
+    absolute = os.path.abspath(path)
+    relative = os.path.relpath(absolute, os.path.abspath(UPLOAD_DIR))
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        return None
+    if DOWNLOAD_OFFLOAD == "x-accel-redirect":
+        return {"X-Accel-Redirect": DOWNLOAD_OFFLOAD_PREFIX.rstrip("/") + "/" + quote(relative.replace(os.sep, "/"))}
+    return {"X-Sendfile": absolute}
+
+def _read_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as source:
+        source.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = source.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def _read_multipart(path: str, ranges, size: int, media_type: str, boundary: str) -> Iterator[bytes]:
+    for start, end in ranges:
+        yield (
+            f"\r\n--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode()
+        yield from _read_range(path, start, end)
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+def _validator_headers(document: models.Document, modified: datetime) -> Dict[str, str]:
+    return {
+        "ETag": document_etag(document),
+        "Last-Modified": format_datetime(modified, usegmt=True),
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+    }
+
+def _last_modified(document: models.Document, path: Optional[str] = None) -> datetime:
+    if document.uploaded_at:
+        modified = document.uploaded_at
+    elif path:
+        modified = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+    else:
+        modified = datetime.fromtimestamp(0, timezone.utc)
+    if modified.tzinfo is None:
+        modified = modified.replace(tzinfo=timezone.utc)
+    return modified.replace(microsecond=0)
+
+def _not_modified(request: Request, etag: str, modified: datetime) -> bool:
+    # Conditional GET: If-None-Match takes precedence over If-Modified-Since
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag, weak=True)
+    since = _parse_http_date(request.headers.get("if-modified-since", ""))
+    return since is not None and modified <= since
+
+def redirect_response(request: Request, document: models.Document, url: str) -> Response:
+    """Send the client to a presigned URL on the object store, which then
+    handles the transfer (including Range) without touching a worker"""
+    modified = _last_modified(document)
+    headers = _validator_headers(document, modified)
+    if _not_modified(request, headers["ETag"], modified):
+        return Response(status_code=304, headers=headers)
+    # The URL expires, so neither the redirect nor the body may be cached
+    headers["Cache-Control"] = "private, no-store"
+    headers["Location"] = url
+    return Response(status_code=307, headers=headers)
+
+def document_response(request: Request, document: models.Document, path: str) -> Response:
+    """Serve a stored document honouring conditional and Range requests"""
+    size = os.path.getsize(path)
+    modified = _last_modified(document, path)
+    media_type = media_type_for(document.file_type)
+    headers = _validator_headers(document, modified)
+    etag = headers["ETag"]
+    if _not_modified(request, etag, modified):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = content_disposition(document.name)
+    offload = offload_headers(path) if DOWNLOAD_OFFLOAD else None
+    if offload:
+        # The proxy streams the body (and handles Range); the worker is free immediately
+        headers.update(offload)
+        return Response(media_type=media_type, headers=headers)
+
+    range_header = request.headers.get("range")
+    if range_header and "if-range" in request.headers:
+        # Only resume if the client's copy is still the current one
+        if_range = request.headers["if-range"].strip()
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            still_valid = if_range == etag
+        else:
+            if_range_date = _parse_http_date(if_range)
+            still_valid = if_range_date is not None and if_range_date == modified
+        if not still_valid:
+            range_header = None
+
+    ranges = parse_range(range_header, size) if range_header else None
+    if ranges is None:
+        return FileResponse(path, media_type=media_type, headers=headers)
+    if not ranges:
+        headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            _read_range(path, start, end), status_code=206, media_type=media_type, headers=headers
+        )
+
+    boundary = uuid.uuid4().hex
+    return StreamingResponse(
+        _read_multipart(path, ranges, size, media_type, boundary),
+        status_code=206,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers=headers,
+    )
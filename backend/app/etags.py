@@ -0,0 +1,65 @@
+import hashlib
+from typing import Optional
+from fastapi import Request, Response
+from app import models
+from app.pagination import NEXT_CURSOR_HEADER
+
+# Weak validators for JSON list and detail responses, computed from the rows
+# being returned: each row's column values, plus those of the nested rows
+# serialized with it. An insert, update or delete that affects the response
+# changes the rows it sees, so it changes the ETag; a matching one skips
+# serialization. No extra query is run. Column values rather than updated_at
+# are used because not every table has one (users, companies) and SQLite
+# stores it to the second, missing quick successive edits.
+
+# Relationship paths serialized by each response schema; keep in step with
+# schemas.py and the loader options in loaders.py
+CASE_NESTED = ("client", "primary_attorney")
+TASK_NESTED = ("case", "case.client", "case.primary_attorney", "assignee", "creator")
+NOTE_NESTED = ("author",)
+
+def _weak(*parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+def _version(obj):
+    return (type(obj).__tablename__, *[getattr(obj, column.key) for column in obj.__mapper__.column_attrs])
+
+def _nested(obj, path: str):
+    for name in path.split("."):
+        if obj is None:
+            return None
+        obj = getattr(obj, name)
+    return obj
+
+def _versions(obj, nested):
+    return (_version(obj), *[_version(related) for path in nested if (related := _nested(obj, path)) is not None])
+
+def list_etag(items, request: Request, response: Response, user: models.User, *nested: str) -> str:
+    """ETag for one fetched page of a list.
+
+    `nested` are dotted relationship paths (e.g. "case.client") to rows
+    serialized with each item; load them with the page's loader options.
+    """
+    versions = [_versions(item, nested) for item in items]
+    # The same URL yields different rows per user; the next-page cursor is
+    # part of the response too
+    return _weak(user.id, user.role, str(request.query_params), response.headers.get(NEXT_CURSOR_HEADER), versions)
+
+def detail_etag(obj, *nested: str) -> str:
+    """ETag for a detail response of `obj`; `nested` as for list_etag"""
+    return _weak(_versions(obj, nested))
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Set the ETag on `response`; return a 304 when the client's copy matches"""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison: W/ prefixes are ignored on both sides
+        opaque = etag[2:]
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*" or candidate.removeprefix("W/") == opaque:
+                return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,59 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import Callable, Iterator
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query, Session
+from app.database import SessionLocal
+from app.downloads import content_disposition
+
+# Rows fetched per round trip from the server-side cursor, and written per
+# chunk of the response
+EXPORT_BATCH_SIZE = 1000
+
+FORMATS = {
+    "csv": "text/csv",  # charset is appended by the response
+    "ndjson": "application/x-ndjson",
+}
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def stream_export(build_query: Callable[[Session], Query], fmt: str) -> Iterator[bytes]:
+    """Run the query on its own session through a server-side cursor and
+    yield it encoded in chunks; memory stays at about one batch of rows."""
+    db = SessionLocal()
+    try:
+        query = build_query(db).execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        columns = [column["name"] for column in query.column_descriptions]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer:
+            writer.writerow(columns)
+        for count, row in enumerate(query, start=1):
+            values = [_plain(value) for value in row]
+            if writer:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(columns, values))))
+                buffer.write("\n")
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode()
+    finally:
+        db.close()
+
+def export_response(build_query: Callable[[Session], Query], fmt: str, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(build_query, fmt),
+        media_type=FORMATS[fmt],
+        headers={"Content-Disposition": content_disposition(f"{name}.{fmt}")},
+    )
@@ -0,0 +1,279 @@
+import csv
+import enum
+import io
+import json
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from pydantic import ValidationError
+from sqlalchemy import func, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.models import UserRole
+from app.routers.cases import generate_case_number
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+ENTITIES = ("clients", "companies", "cases")
+FORMATS = ("csv", "ndjson")
+
+Record = Tuple[int, dict]  # (line number, raw fields)
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[Record]:
+    """Yield rows from a CSV (with a header row) or NDJSON text stream.
+
+    Empty and null fields are left out, so schema defaults apply to them.
+    Parse errors are yielded as records carrying an "__error__" key so they
+    are reported like any other bad row.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            # CSV has no null: empty cells mean "not provided"
+            yield reader.line_num, _provided({
+                (key or "").strip(): value.strip() if isinstance(value, str) else value
+                for key, value in record.items()
+            })
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                yield line_number, {"__error__": f"Invalid JSON: {error}"}
+                continue
+            if not isinstance(record, dict):
+                yield line_number, {"__error__": "Expected a JSON object"}
+                continue
+            yield line_number, _provided(record)
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+def _provided(record: dict) -> dict:
+    return {key: value for key, value in record.items() if value is not None and value != ""}
+
+def format_for(filename: Optional[str]) -> Optional[str]:
+    if filename:
+        extension = filename.rsplit(".", 1)[-1].lower()
+        if extension == "csv":
+            return "csv"
+        if extension in ("ndjson", "jsonl"):
+            return "ndjson"
+    return None
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}" for item in error.errors()
+    )
+
+def _lookup(db: Session, column, values) -> Dict[str, List[int]]:
+    """Map lower-cased natural keys to the ids that carry them"""
+    found: Dict[str, List[int]] = {}
+    if values:
+        model = column.class_
+        for row_id, value in db.query(model.id, column).filter(func.lower(column).in_(values)):
+            found.setdefault(value.lower(), []).append(row_id)
+    return found
+
+def _resolve(found: Dict[str, List[int]], value: str, label: str) -> int:
+    ids = found.get(value.lower(), [])
+    if not ids:
+        raise LookupError(f"No {label} matching {value!r}")
+    if len(ids) > 1:
+        raise LookupError(f"{len(ids)} {label}s match {value!r}")
+    return ids[0]
+
+class Importer:
+    """Validates and inserts rows for one entity type in large batches.
+
+    Each batch is inserted with COPY on Postgres and a single executemany
+    elsewhere, inside a savepoint. If the batch is rejected by the database
+    it is retried row by row, so one bad row only fails itself. Every batch
+    is committed, so an interrupted import keeps what it has done.
+    """
+
+    def __init__(self, db: Session, entity: str, user: Optional[models.User] = None,
+                 batch_size: int = BATCH_SIZE):
+        if entity not in ENTITIES:
+            raise ValueError(f"Unknown import entity: {entity}")
+        self.db = db
+        self.entity = entity
+        self.user = user
+        self.batch_size = batch_size
+        self.result = schemas.ImportResult(entity=entity, processed=0, inserted=0, failed=0, errors=[])
+
+    def fail(self, line_number: int, message: str):
+        self.result.failed += 1
+        if len(self.result.errors) < MAX_REPORTED_ERRORS:
+            self.result.errors.append(schemas.ImportRowError(row=line_number, error=message))
+
+    def run(self, records: Iterable[Record]) -> schemas.ImportResult:
+        batch: List[Record] = []
+        for record in records:
+            self.result.processed += 1
+            if "__error__" in record[1]:
+                self.fail(record[0], record[1]["__error__"])
+                continue
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                self.import_batch(batch)
+                batch = []
+        if batch:
+            self.import_batch(batch)
+        self.result.errors.sort(key=lambda error: error.row)
+        return self.result
+
+    def import_batch(self, batch: List[Record]):
+        if self.entity == "clients":
+            table, rows = models.Client.__table__, self.prepare_simple(batch, schemas.ClientCreate, {"is_active": True})
+        elif self.entity == "companies":
+            table, rows = models.Company.__table__, self.prepare_simple(batch, schemas.CompanyCreate, {})
+        else:
+            table, rows = models.Case.__table__, self.prepare_cases(batch)
+
+        inserted = self.insert(table, rows)
+        if self.entity == "cases":
+            self.link_companies(inserted)
+        self.db.commit()
+        self.result.inserted += len(inserted)
+
+    def prepare_simple(self, batch: List[Record], schema, extra: dict) -> List[Tuple[int, dict, None]]:
+        rows = []
+        for line_number, record in batch:
+            try:
+                data = schema.model_validate(record)
+            except ValidationError as error:
+                self.fail(line_number, _validation_message(error))
+                continue
+            rows.append((line_number, {**data.model_dump(), **extra}, None))
+        return rows
+
+    def prepare_cases(self, batch: List[Record]) -> List[Tuple[int, dict, Optional[dict]]]:
+        """Resolve client, attorney and company references, then validate"""
+        def keys(field):
+            return {str(record[field]).lower() for _, record in batch if record.get(field)}
+
+        clients_by_email = _lookup(self.db, models.Client.email, keys("client_email"))
+        clients_by_name = _lookup(self.db, models.Client.name, keys("client_name"))
+        attorneys = _lookup(self.db, models.User.email, keys("attorney_email"))
+        companies = _lookup(self.db, models.Company.name, keys("company_name"))
+        numbers = {str(record["case_number"]) for _, record in batch if record.get("case_number")}
+        taken = {
+            row[0] for row in
+            self.db.query(models.Case.case_number).filter(models.Case.case_number.in_(numbers))
+        } if numbers else set()
+
+        # Lawyers' cases default to themselves, as in create_case
+        default_attorney = self.user.id if self.user and self.user.role == UserRole.LAWYER else None
+
+        rows = []
+        for line_number, record in batch:
+            data = dict(record)
+            link = None
+            try:
+                if data.get("client_email"):
+                    data["client_id"] = _resolve(clients_by_email, str(data["client_email"]), "client")
+                elif data.get("client_name") and not data.get("client_id"):
+                    data["client_id"] = _resolve(clients_by_name, str(data["client_name"]), "client")
+                if data.get("attorney_email"):
+                    data["primary_attorney_id"] = _resolve(attorneys, str(data["attorney_email"]), "user")
+                if data.get("company_name"):
+                    link = {
+                        "company_id": _resolve(companies, str(data["company_name"]), "company"),
+                        "relationship_type": data.get("relationship_type"),
+                    }
+                case_number = str(data["case_number"]) if data.get("case_number") else generate_case_number()
+                if case_number in taken:
+                    raise LookupError(f"Case number {case_number} already exists")
+                case = schemas.CaseCreate.model_validate(data)
+            except LookupError as error:
+                self.fail(line_number, str(error))
+                continue
+            except ValidationError as error:
+                self.fail(line_number, _validation_message(error))
+                continue
+            taken.add(case_number)
+            row = case.model_dump()
+            row["case_number"] = case_number
+            row["primary_attorney_id"] = row["primary_attorney_id"] or default_attorney
+            rows.append((line_number, row, link))
+        # Unknown client ids would otherwise only surface as a failed batch
+        client_ids = {row["client_id"] for _, row, _ in rows}
+        known = {row[0] for row in self.db.query(models.Client.id).filter(models.Client.id.in_(client_ids))}
+        valid = []
+        for line_number, row, link in rows:
+            if row["client_id"] in known:
+                valid.append((line_number, row, link))
+            else:
+                self.fail(line_number, f"No client with id {row['client_id']}")
+        return valid
+
+    def insert(self, table, rows):
+        """Insert rows, returning those that made it in"""
+        if not rows:
+            return []
+        try:
+            with self.db.begin_nested():
+                bulk_insert(self.db, table, [row for _, row, _ in rows])
+            return rows
+        except SQLAlchemyError:
+            pass
+        # The batch was rejected; find the offending rows one at a time
+        inserted = []
+        for line_number, row, link in rows:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(table), [row])
+                inserted.append((line_number, row, link))
+            except SQLAlchemyError as error:
+                self.fail(line_number, str(getattr(error, "orig", error)).splitlines()[0])
+        return inserted
+
+    def link_companies(self, inserted):
+        links = [(row["case_number"], link) for _, row, link in inserted if link]
+        if not links:
+            return
+        case_ids = dict(
+            self.db.query(models.Case.case_number, models.Case.id)
+            .filter(models.Case.case_number.in_([number for number, _ in links]))
+        )
+        self.db.execute(
+            insert(models.CaseCompany.__table__),
+            [{"case_id": case_ids[number], **link} for number, link in links],
+        )
+
+def _copy_field(value) -> str:
+    # COPY csv: an unquoted empty field is NULL, anything quoted is a value
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    elif isinstance(value, enum.Enum):
+        value = value.name  # SQLAlchemy Enum columns store member names
+    elif isinstance(value, date):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+def bulk_insert(db: Session, table, rows: List[dict]):
+    """Insert `rows` (dicts with the same keys) into `table`: COPY on Postgres,
+    one executemany elsewhere"""
+    if db.get_bind().dialect.name != "postgresql":
+        db.execute(insert(table), rows)
+        return
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_copy_field(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+def import_stream(db: Session, entity: str, stream: TextIO, fmt: str,
+                  user: Optional[models.User] = None, batch_size: int = BATCH_SIZE) -> schemas.ImportResult:
+    return Importer(db, entity, user, batch_size).run(iter_records(stream, fmt))
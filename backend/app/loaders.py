@@ -0,0 +1,34 @@
+from sqlalchemy.orm import joinedload, selectinload
+from app import models
+
+# Loader options matching the nesting of the response schemas, so list
+# endpoints load every relationship they serialize in a fixed number of
+# queries instead of one lazy load per row.
+#
+# Many-to-one relationships that are shared by many rows (users, clients)
+# use selectinload: one extra "WHERE id IN (...)" query per relationship,
+# without repeating the same wide user/client columns on every joined row.
+
+def case_options():
+    """Options for schemas.CaseResponse (client, primary_attorney)"""
+    return [
+        selectinload(models.Case.client),
+        selectinload(models.Case.primary_attorney),
+    ]
+
+def task_options():
+    """Options for schemas.TaskResponse (case -> client/attorney, assignee, creator)"""
+    return [
+        joinedload(models.Task.case).selectinload(models.Case.client),
+        joinedload(models.Task.case).selectinload(models.Case.primary_attorney),
+        selectinload(models.Task.assignee),
+        selectinload(models.Task.creator),
+    ]
+
+def document_options():
+    """Options for schemas.DocumentResponse (uploaded_by)"""
+    return [selectinload(models.Document.uploaded_by)]
+
+def note_options():
+    """Options for schemas.NoteResponse (author)"""
+    return [selectinload(models.Note.author)]
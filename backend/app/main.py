@@ -1,12 +1,37 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from anyio import to_thread
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
-from app.routers import auth, users, cases, tasks, documents, notes, clients, companies
+from fastapi.responses import ORJSONResponse
+from app.database import engine, Base, DB_THREADPOOL_SIZE
+from app.routers import auth, users, cases, tasks, documents, notes, clients, companies, dashboard, search, uploads, imports
+from app import cache, metrics, models, passwords
+from app.pooling import pool_stats
+from app.sqlprofile import SQLProfilerMiddleware
+from app.auth import require_role
+from app.models import UserRole
 
 # Database tables are managed by Alembic migrations
 # To create tables: alembic upgrade head
 
-app = FastAPI(title="CasePilot API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Route handlers using the database are plain `def` functions, which
+    # FastAPI runs in this threadpool so blocking queries never stall the
+    # event loop. Its size bounds how many requests hit the database at once.
+    to_thread.current_default_thread_limiter().total_tokens = DB_THREADPOOL_SIZE
+    yield
+    metrics.mark_process_dead()
+
+# orjson renders every JSON response; the big list endpoints additionally
+# bypass response_model handling via app.responses.list_response
+app = FastAPI(title="CasePilot API", version="1.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Per-route request metrics for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Statement counts and database time per request (logged; headers in DEBUG)
+app.add_middleware(SQLProfilerMiddleware)
 
 # CORS middleware
 import os
@@ -18,6 +43,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-DB-Statements", "X-DB-Time-Ms", "X-DB-N-Plus-One"],
 )
 
 # Include routers
@@ -29,11 +55,25 @@ app.include_router(documents.router, prefix="/api/documents", tags=["documents"]
 app.include_router(notes.router, prefix="/api/notes", tags=["notes"])
 app.include_router(clients.router, prefix="/api/clients", tags=["clients"])
 app.include_router(companies.router, prefix="/api/companies", tags=["companies"])
+app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
+app.include_router(uploads.router, prefix="/api/uploads", tags=["uploads"])
+app.include_router(imports.router, prefix="/api/import", tags=["import"])
 
 @app.get("/api/health")
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/api/health/stats")
+def health_stats(current_user: models.User = Depends(require_role([UserRole.OWNER]))):
+    return {
+        "caches": cache.all_stats(),
+        "password_hashing": passwords.pool.stats(),
+        "database_pool": pool_stats(engine.pool),
+    }
 
-
-
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    # Runs on the event loop: scrapes never wait for a threadpool worker
+    # behind slow database requests
+    return metrics.metrics_response(request)
@@ -0,0 +1,122 @@
+import os
+import secrets
+import time
+from typing import Optional
+from dotenv import load_dotenv
+
+# prometheus_client chooses in-process or multiprocess storage on import,
+# so PROMETHEUS_MULTIPROC_DIR from .env has to be loaded before it
+load_dotenv()
+
+from fastapi import Request, Response
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import multiprocess
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Prometheus metrics, served at /metrics.
+#
+# The endpoint is closed by default: it answers 404 until METRICS_TOKEN is
+# set, and then only to requests carrying "Authorization: Bearer <token>"
+# (Prometheus: `authorization: {credentials: <token>}` in the scrape config).
+# METRICS_PUBLIC=true serves it without a token; use that only when /metrics
+# is reachable solely from the monitoring network, e.g. blocked at the proxy.
+#
+# With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty
+# directory before starting them: every worker then writes its values to
+# memory-mapped files there and a scrape of any worker aggregates them all.
+# Without it, values live in this process only.
+#
+# Request metrics are recorded by the middleware on the event loop thread,
+# so their locks are never contended. Cache hit ratios come from
+#   rate(casepilot_cache_hits_total[5m]) / (rate(casepilot_cache_hits_total[5m]) + rate(casepilot_cache_misses_total[5m]))
+
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+# Bearer token required to scrape /metrics
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").strip().lower() in ("1", "true", "yes")
+
+# Requests that matched no route share one label, keeping cardinality bounded
+UNMATCHED_ROUTE = "<unmatched>"
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+REQUESTS = Counter(
+    "casepilot_http_requests_total", "HTTP requests by route and status", ["method", "route", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "casepilot_http_request_duration_seconds", "Time to send the full response", ["method", "route"],
+)
+RESPONSE_SIZE = Histogram(
+    "casepilot_http_response_size_bytes", "Response body size", ["method", "route"], buckets=SIZE_BUCKETS,
+)
+IN_PROGRESS = Gauge(
+    "casepilot_http_requests_in_progress", "Requests being handled", ["method"], multiprocess_mode="livesum",
+)
+
+DB_POOL_SIZE = Gauge("casepilot_db_pool_size", "Connections the pool keeps open", multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge("casepilot_db_pool_checked_out", "Connections in use", multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge("casepilot_db_pool_overflow", "Connections open beyond the pool size", multiprocess_mode="livesum")
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "casepilot_db_pool_checkout_wait_seconds", "Time waited for a database connection",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+DB_POOL_TIMEOUTS = Counter("casepilot_db_pool_timeouts_total", "Checkouts that gave up waiting for a connection")
+
+CACHE_HITS = Counter("casepilot_cache_hits_total", "Cache lookups that found a live entry", ["cache"])
+CACHE_MISSES = Counter("casepilot_cache_misses_total", "Cache lookups that found nothing", ["cache"])
+
+class MetricsMiddleware:
+    """Per-route request counts, latency, response size and in-flight requests"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        size = 0
+        started = time.perf_counter()
+
+        async def send_counting(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_counting)
+        finally:
+            in_progress.dec()
+            # The router stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            REQUESTS.labels(method, route, str(status)).inc()
+            REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - started)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+
+def _registry() -> CollectorRegistry:
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+def metrics_response(request: Request) -> Response:
+    if not METRICS_PUBLIC:
+        if not METRICS_TOKEN:
+            return Response(status_code=404)
+        authorization = request.headers.get("authorization", "")
+        if not secrets.compare_digest(authorization.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+            return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop this worker's live gauges from the multiprocess aggregate"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Enum as SQLEnum, Date
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Enum as SQLEnum, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -96,6 +96,11 @@ class Case(Base):
     notes = relationship("Note", back_populates="case", cascade="all, delete-orphan")
     case_companies = relationship("CaseCompany", back_populates="case", cascade="all, delete-orphan")
     case_assistants = relationship("CaseAssistant", back_populates="case", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Lawyers' case scope, optionally filtered by status
+        Index("ix_cases_attorney_status", "primary_attorney_id", "status"),
+    )
 
 class CaseCompany(Base):
     __tablename__ = "case_companies"
@@ -119,6 +124,11 @@ class CaseAssistant(Base):
     # Relationships
     case = relationship("Case", back_populates="case_assistants")
     assistant = relationship("User")
+    
+    __table_args__ = (
+        # An assistant is on a case at most once; also serves case access lookups
+        Index("ix_case_assistants_assistant_case", "assistant_id", "case_id", unique=True),
+    )
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -129,7 +139,7 @@ class Task(Base):
     status = Column(SQLEnum(TaskStatus), default=TaskStatus.TODO, nullable=False)
     priority = Column(SQLEnum(TaskPriority), default=TaskPriority.MEDIUM, nullable=False)
     due_date = Column(Date, nullable=True)
-    case_id = Column(Integer, ForeignKey("cases.id"), nullable=False)
+    case_id = Column(Integer, ForeignKey("cases.id"), nullable=False, index=True)
     assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -140,6 +150,11 @@ class Task(Base):
     case = relationship("Case", back_populates="tasks")
     assignee = relationship("User", foreign_keys=[assignee_id], back_populates="assigned_tasks")
     creator = relationship("User", foreign_keys=[created_by_id], back_populates="created_tasks")
+    
+    __table_args__ = (
+        # "My tasks" views: assignee, then status / due-date filters
+        Index("ix_tasks_assignee_status_due", "assignee_id", "status", "due_date"),
+    )
 
 class Document(Base):
     __tablename__ = "documents"
@@ -150,7 +165,8 @@ class Document(Base):
     file_type = Column(String, nullable=True)  # pdf, docx, etc.
     document_type = Column(String, nullable=True)  # medical_report, legal_document, correspondence, etc.
     file_size = Column(Integer, nullable=True)  # in bytes
-    case_id = Column(Integer, ForeignKey("cases.id"), nullable=False)
+    sha256 = Column(String(64), nullable=True, index=True)  # hex digest of the file contents
+    case_id = Column(Integer, ForeignKey("cases.id"), nullable=False, index=True)
     uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -172,6 +188,11 @@ class Note(Base):
     # Relationships
     case = relationship("Case", back_populates="notes")
     author = relationship("User", back_populates="notes")
+    
+    __table_args__ = (
+        # Case notes, pinned first then newest
+        Index("ix_notes_case_pinned_created", "case_id", "is_pinned", "created_at"),
+    )
 
 
 
@@ -0,0 +1,44 @@
+import base64
+import json
+from typing import Optional
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(value: int) -> str:
+    """Encode the last seen key as an opaque cursor"""
+    raw = json.dumps({"k": value}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded))["k"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(value, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+def paginate(query, column, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    """Return one page of `query` ordered by the unique, indexed `column`.
+
+    With a cursor the page starts right after the last key of the previous
+    page (an index range scan, so deep pages cost the same as the first one).
+    Without one, `skip` is applied as before for compatibility. When more
+    rows remain, the cursor for the next page is set on the response header.
+    """
+    query = query.order_by(column)
+    if cursor:
+        query = query.filter(column > decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether there is a next page
+    items = query.limit(limit + 1).all()
+    has_more = len(items) > limit
+    items = items[:limit]
+    if has_more and items:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(items[-1], column.key))
+    return items
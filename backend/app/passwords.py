@@ -0,0 +1,90 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List
+from passlib.context import CryptContext
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# bcrypt releases the GIL while hashing, so threads give real parallelism;
+# the cap keeps a login burst from taking every core away from other work.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+class HashingPool:
+    """Dedicated, size-capped executor for password hashing with queue metrics"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def submit(self, fn: Callable, *args) -> Future:
+        enqueued_at = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+
+        def run():
+            waited = time.perf_counter() - enqueued_at
+            with self._lock:
+                self.queued -= 1
+                self.in_flight += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                    self.completed += 1
+
+        return self._executor.submit(run)
+
+    def run(self, fn: Callable, *args) -> Any:
+        """Run `fn` in the pool and wait for its result"""
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable, *args) -> Any:
+        """Run `fn` in the pool; the caller awaits without holding a thread"""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "wait_seconds_avg": self.wait_seconds_total / self.completed if self.completed else 0.0,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+pool = HashingPool(PASSWORD_HASH_WORKERS)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pool.run(pwd_context.verify, plain_password, hashed_password)
+
+def hash_password(password: str) -> str:
+    return pool.run(pwd_context.hash, password)
+
+# For async handlers: a sync caller blocks a threadpool worker for as long as
+# the hash waits in the queue, so a login burst could take every worker
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await pool.run_async(pwd_context.verify, plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await pool.run_async(pwd_context.hash, password)
+
+def hash_passwords(passwords: Iterable[str]) -> List[str]:
+    """Hash many passwords in parallel, preserving order"""
+    futures = [pool.submit(pwd_context.hash, password) for password in passwords]
+    return [future.result() for future in futures]
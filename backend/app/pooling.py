@@ -0,0 +1,121 @@
+import bisect
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, QueuePool
+from dotenv import load_dotenv
+from app import metrics
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Checkouts waiting longer than this many seconds are logged with the pool state
+DB_POOL_SLOW_CHECKOUT = float(os.getenv("DB_POOL_SLOW_CHECKOUT", "0.1"))
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class PoolMetrics:
+    """Thread-safe counters for connection checkouts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._buckets = [0] * (len(WAIT_BUCKETS) + 1)  # last one is +Inf
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            self._buckets[bisect.bisect_left(WAIT_BUCKETS, waited)] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            histogram, cumulative = {}, 0
+            # Cumulative counts per upper bound, as in a Prometheus histogram
+            for bound, count in zip((*WAIT_BUCKETS, "+Inf"), self._buckets):
+                cumulative += count
+                histogram[str(bound)] = cumulative
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_sum": self.wait_seconds_total,
+                "wait_seconds_avg": self.wait_seconds_total / waits if waits else 0.0,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_histogram": histogram,
+            }
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that measures how long each checkout waits for a connection.
+
+    The wait covers queueing for a free connection and, when the pool grows,
+    opening a new one. Slow checkouts and timeouts are logged with the pool
+    state at that moment.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        metrics.DB_POOL_SIZE.set(self.size())
+
+    def _export_state(self):
+        metrics.DB_POOL_CHECKED_OUT.set(self.checkedout())
+        metrics.DB_POOL_OVERFLOW.set(max(self.overflow(), 0))
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            waited = time.perf_counter() - started
+            self.metrics.record(waited, timed_out=True)
+            metrics.DB_POOL_TIMEOUTS.inc()
+            logger.warning("Database pool exhausted after %.3fs: %s", waited, self.status())
+            raise
+        waited = time.perf_counter() - started
+        self.metrics.record(waited)
+        metrics.DB_POOL_CHECKOUT_WAIT.observe(waited)
+        self._export_state()
+        if waited >= DB_POOL_SLOW_CHECKOUT:
+            logger.warning("Slow database connection checkout (%.3fs): %s", waited, self.status())
+        return connection
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._export_state()
+
+    def recreate(self):
+        # Pool.recreate() builds a fresh pool after dispose(); keep counting
+        # into the same metrics rather than resetting them
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """Live state of `pool`, plus checkout metrics for a TimedQueuePool"""
+    stats: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # overflow() counts unopened core slots as negative
+            "overflow": max(pool.overflow(), 0),
+        })
+    if isinstance(pool, TimedQueuePool):
+        stats.update(pool.metrics.snapshot())
+    return stats
@@ -0,0 +1,72 @@
+from typing import Any, Dict, List, Optional, Type, get_args
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from app import schemas
+
+# Fast path for the large list responses. Endpoints return list_response(...)
+# directly, skipping FastAPI's generic response_model handling (validate,
+# jsonable_encoder, json.dumps); the response_model on the route still
+# documents the schema.
+#
+# Nested rows repeat heavily in a page (every task of a case carries the same
+# case, client and attorney), so each distinct ORM object is validated once
+# per response and reused. This matters most for UserResponse, whose EmailStr
+# validation dominates the generic path.
+
+def _nested_model(annotation) -> Optional[Type[BaseModel]]:
+    for candidate in (annotation, *get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
+
+class ListSerializer:
+    """Prebuilt serializer for List[model] from ORM objects"""
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.adapter = TypeAdapter(List[model])
+        self._nested: Dict[Type[BaseModel], Dict[str, Type[BaseModel]]] = {}
+
+    def _nested_fields(self, model: Type[BaseModel]) -> Dict[str, Type[BaseModel]]:
+        fields = self._nested.get(model)
+        if fields is None:
+            fields = {}
+            for name, field in model.model_fields.items():
+                nested = _nested_model(field.annotation)
+                if nested:
+                    fields[name] = nested
+            self._nested[model] = fields
+        return fields
+
+    def _validate(self, obj: Any, model: Type[BaseModel], memo: dict) -> BaseModel:
+        key = (id(obj), model)
+        instance = memo.get(key)
+        if instance is None:
+            nested = self._nested_fields(model)
+            if nested:
+                data = {name: getattr(obj, name, None) for name in model.model_fields}
+                for name, nested_model in nested.items():
+                    if data[name] is not None:
+                        data[name] = self._validate(data[name], nested_model, memo)
+                instance = model.model_validate(data)
+            else:
+                instance = model.model_validate(obj)
+            memo[key] = instance
+        return instance
+
+    def dump_json(self, rows: List[Any]) -> bytes:
+        memo: dict = {}  # ids are stable: `rows` keeps every object alive
+        return self.adapter.dump_json([self._validate(row, self.model, memo) for row in rows])
+
+CASE_LIST = ListSerializer(schemas.CaseResponse)
+TASK_LIST = ListSerializer(schemas.TaskResponse)
+DOCUMENT_LIST = ListSerializer(schemas.DocumentResponse)
+NOTE_LIST = ListSerializer(schemas.NoteResponse)
+CLIENT_LIST = ListSerializer(schemas.ClientResponse)
+COMPANY_LIST = ListSerializer(schemas.CompanyResponse)
+
+def list_response(serializer: ListSerializer, rows: List[Any], response: Response) -> Response:
+    """JSON response for `rows`, keeping headers set on the injected
+    `response` (X-Next-Cursor, ETag, ...)"""
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return Response(content=serializer.dump_json(rows), media_type="application/json", headers=headers)
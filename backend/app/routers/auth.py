@@ -1,20 +1,49 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app import models, schemas, auth
-from app.auth import create_access_token, verify_password, get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.auth import create_access_token, verify_password_async, get_password_hash_async, ACCESS_TOKEN_EXPIRE_MINUTES
 
 router = APIRouter()
 
+# login and register are async so that, while the password hash waits in the
+# bounded pool, no threadpool worker is held; only their database work runs
+# in the threadpool. The lookup also closes the session, returning its
+# connection to the pool for the duration of the hash.
+
+def _user_by_email(db: Session, email: str):
+    user = db.query(models.User).filter(models.User.email == email).first()
+    # Closing detaches `user` with its loaded columns intact
+    db.close()
+    return user
+
+def _record_login(db: Session, user_id: int, email: str):
+    db.query(models.User).filter(models.User.id == user_id).update({models.User.last_login: datetime.utcnow()})
+    db.commit()
+    auth.invalidate_principal(email)
+
+def _create_user(db: Session, user_data: schemas.UserCreate, hashed_password: str) -> models.User:
+    db_user = models.User(
+        email=user_data.email,
+        hashed_password=hashed_password,
+        full_name=user_data.full_name,
+        role=user_data.role
+    )
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
 @router.post("/login", response_model=schemas.Token)
 async def login(
     payload: schemas.LoginRequest,
     db: Session = Depends(get_db)
 ):
-    user = db.query(models.User).filter(models.User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
+    user = await run_in_threadpool(_user_by_email, db, payload.email)
+    if not user or not await verify_password_async(payload.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -24,9 +53,7 @@ async def login(
         raise HTTPException(status_code=400, detail="Inactive user")
     
     # Update last login
-    from datetime import datetime
-    user.last_login = datetime.utcnow()
-    db.commit()
+    await run_in_threadpool(_record_login, db, user.id, user.email)
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -40,22 +67,12 @@ async def register(
     db: Session = Depends(get_db)
 ):
     # Check if user exists
-    db_user = db.query(models.User).filter(models.User.email == user_data.email).first()
-    if db_user:
+    if await run_in_threadpool(_user_by_email, db, user_data.email):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
-    db_user = models.User(
-        email=user_data.email,
-        hashed_password=hashed_password,
-        full_name=user_data.full_name,
-        role=user_data.role
-    )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    hashed_password = await get_password_hash_async(user_data.password)
+    return await run_in_threadpool(_create_user, db, user_data, hashed_password)
 
 @router.get("/me", response_model=schemas.UserResponse)
 async def get_current_user_info(
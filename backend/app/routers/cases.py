@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from datetime import date
 from app.database import get_db
-from app import models, schemas, auth, utils
+from app import models, schemas, auth, utils, loaders, archives, exports, etags, responses
 from app.auth import require_role
+from app.pagination import paginate
+from app.downloads import content_disposition
 from app.models import UserRole
 import uuid
 
@@ -17,38 +21,19 @@ def generate_case_number() -> str:
     unique_id = str(uuid.uuid4())[:8].upper()
     return f"CASE-{year}-{unique_id}"
 
-@router.get("", response_model=List[schemas.CaseResponse])
-async def get_cases(
-    skip: int = 0,
-    limit: int = 100,
+def filter_cases(
+    query,
+    case_ids,
     status: Optional[str] = None,
     client_id: Optional[int] = None,
     attorney_id: Optional[int] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.get_current_active_user)
 ):
-    query = db.query(models.Case)
-    
-    # Filter by role
-    if current_user.role == UserRole.ASSISTANT:
-        # Assistants only see cases they're assigned to
-        query = query.join(models.CaseAssistant).filter(
-            models.CaseAssistant.assistant_id == current_user.id
-        )
-    elif current_user.role == UserRole.LAWYER:
-        # Lawyers see cases where they're primary attorney or team member
-        query = query.filter(
-            or_(
-                models.Case.primary_attorney_id == current_user.id,
-                models.Case.id.in_(
-                    db.query(models.CaseAssistant.case_id).filter(
-                        models.CaseAssistant.assistant_id == current_user.id
-                    )
-                )
-            )
-        )
-    # Owners see all cases (no filter)
+    """Role scoping (`case_ids` from utils.accessible_case_ids) and list filters"""
+    # Assistants see cases they're assigned to, lawyers cases where they're
+    # primary attorney or team member; owners see all cases (no filter)
+    if case_ids is not None:
+        query = query.filter(models.Case.id.in_(case_ids))
     
     # Apply filters
     if status:
@@ -64,13 +49,81 @@ async def get_cases(
                 models.Case.case_number.ilike(f"%{search}%")
             )
         )
+    return query
+
+@router.get("", response_model=List[schemas.CaseResponse])
+def get_cases(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    client_id: Optional[int] = None,
+    attorney_id: Optional[int] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    query = filter_cases(
+        db.query(models.Case), utils.accessible_case_ids(current_user), status, client_id, attorney_id, search
+    )
     
-    cases = query.offset(skip).limit(limit).all()
-    return cases
+    query = query.options(*loaders.case_options())
+    cases = paginate(query, models.Case.id, response, skip, limit, cursor)
+    
+    # Unchanged pages skip serialization
+    etag = etags.list_etag(cases, request, response, current_user, *etags.CASE_NESTED)
+    not_modified = etags.not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+    return responses.list_response(responses.CASE_LIST, cases, response)
+
+@router.get("/export")
+def export_cases(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    status: Optional[str] = None,
+    client_id: Optional[int] = None,
+    attorney_id: Optional[int] = None,
+    search: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Every matching case as flat CSV or NDJSON rows, streamed"""
+    case_ids = utils.accessible_case_ids(current_user)
+    
+    def build_query(export_db: Session):
+        query = (
+            export_db.query(
+                models.Case.id,
+                models.Case.case_number,
+                models.Case.title,
+                models.Case.description,
+                models.Case.case_type,
+                models.Case.status,
+                models.Case.client_id,
+                models.Client.name.label("client_name"),
+                models.Case.primary_attorney_id,
+                models.User.email.label("attorney_email"),
+                models.Case.opened_date,
+                models.Case.next_hearing_date,
+                models.Case.statute_of_limitations,
+                models.Case.created_at,
+                models.Case.updated_at,
+            )
+            .join(models.Client, models.Client.id == models.Case.client_id)
+            .outerjoin(models.User, models.User.id == models.Case.primary_attorney_id)
+        )
+        query = filter_cases(query, case_ids, status, client_id, attorney_id, search)
+        return query.order_by(models.Case.id)
+    
+    return exports.export_response(build_query, format, "cases")
 
 @router.get("/{case_id}", response_model=schemas.CaseResponse)
-async def get_case(
+def get_case(
     case_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
@@ -78,13 +131,46 @@ async def get_case(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
-    if not utils.can_access_case(current_user, case):
+    if not utils.can_access_case(db, current_user, case.id):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    return case
+    return etags.not_modified(request, response, etags.detail_etag(case, *etags.CASE_NESTED)) or case
+
+@router.get("/{case_id}/documents.zip")
+def download_case_documents(
+    case_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    case = db.query(models.Case).filter(models.Case.id == case_id).first()
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+    
+    # One access check covers every document in the bundle
+    if not utils.can_access_case(db, current_user, case.id):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    # Plain column rows: the archive is streamed after the session is released
+    entries = [
+        archives.ArchiveEntry(*row) for row in
+        db.query(
+            models.Document.name,
+            models.Document.file_path,
+            models.Document.file_type,
+            models.Document.file_size,
+            models.Document.uploaded_at,
+        )
+        .filter(models.Document.case_id == case.id)
+        .order_by(models.Document.id)
+    ]
+    return StreamingResponse(
+        archives.zip_stream(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition(f"{case.case_number}-documents.zip")},
+    )
 
 @router.post("", response_model=schemas.CaseResponse)
-async def create_case(
+def create_case(
     case_data: schemas.CaseCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
@@ -119,7 +205,7 @@ async def create_case(
     return db_case
 
 @router.put("/{case_id}", response_model=schemas.CaseResponse)
-async def update_case(
+def update_case(
     case_id: int,
     case_data: schemas.CaseUpdate,
     db: Session = Depends(get_db),
@@ -129,7 +215,7 @@ async def update_case(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
-    if not utils.can_access_case(current_user, case):
+    if not utils.can_access_case(db, current_user, case.id):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     # Only owners and primary attorneys can edit
@@ -159,7 +245,7 @@ async def update_case(
     return case
 
 @router.delete("/{case_id}")
-async def delete_case(
+def delete_case(
     case_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_role([UserRole.OWNER]))
@@ -173,7 +259,7 @@ async def delete_case(
     return {"message": "Case deleted"}
 
 @router.post("/{case_id}/assistants/{assistant_id}")
-async def assign_assistant(
+def assign_assistant(
     case_id: int,
     assistant_id: int,
     db: Session = Depends(get_db),
@@ -183,7 +269,7 @@ async def assign_assistant(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
-    if not utils.can_access_case(current_user, case):
+    if not utils.can_access_case(db, current_user, case.id):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     # Check if assistant exists
@@ -204,11 +290,16 @@ async def assign_assistant(
     
     case_assistant = models.CaseAssistant(case_id=case_id, assistant_id=assistant_id)
     db.add(case_assistant)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent assignment (unique index)
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Assistant already assigned")
     return {"message": "Assistant assigned"}
 
 @router.delete("/{case_id}/assistants/{assistant_id}")
-async def remove_assistant(
+def remove_assistant(
     case_id: int,
     assistant_id: int,
     db: Session = Depends(get_db),
@@ -218,7 +309,7 @@ async def remove_assistant(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
-    if not utils.can_access_case(current_user, case):
+    if not utils.can_access_case(db, current_user, case.id):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     case_assistant = db.query(models.CaseAssistant).filter(
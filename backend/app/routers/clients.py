@@ -1,20 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from typing import List, Optional
 from app.database import get_db
-from app import models, schemas, auth
+from app import models, schemas, auth, etags, responses
 from app.auth import require_role
 from app.models import UserRole
+from app.pagination import paginate
 
 router = APIRouter()
 
 @router.get("", response_model=List[schemas.ClientResponse])
-async def get_clients(
+def get_clients(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
     is_active: Optional[bool] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
@@ -32,22 +36,29 @@ async def get_clients(
     if is_active is not None:
         query = query.filter(models.Client.is_active == is_active)
     
-    clients = query.offset(skip).limit(limit).all()
-    return clients
+    clients = paginate(query, models.Client.id, response, skip, limit, cursor)
+    
+    # Unchanged pages skip serialization
+    not_modified = etags.not_modified(request, response, etags.list_etag(clients, request, response, current_user))
+    if not_modified:
+        return not_modified
+    return responses.list_response(responses.CLIENT_LIST, clients, response)
 
 @router.get("/{client_id}", response_model=schemas.ClientResponse)
-async def get_client(
+def get_client(
     client_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
     client = db.query(models.Client).filter(models.Client.id == client_id).first()
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
-    return client
+    return etags.not_modified(request, response, etags.detail_etag(client)) or client
 
 @router.post("", response_model=schemas.ClientResponse)
-async def create_client(
+def create_client(
     client_data: schemas.ClientCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
@@ -68,7 +79,7 @@ async def create_client(
     return db_client
 
 @router.put("/{client_id}", response_model=schemas.ClientResponse)
-async def update_client(
+def update_client(
     client_id: int,
     client_data: schemas.ClientUpdate,
     db: Session = Depends(get_db),
@@ -98,7 +109,7 @@ async def update_client(
     return client
 
 @router.delete("/{client_id}")
-async def delete_client(
+def delete_client(
     client_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_role([UserRole.OWNER]))
@@ -1,18 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
-from app import models, schemas, auth
+from app import models, schemas, auth, etags, responses
 from app.models import UserRole
+from app.pagination import paginate
 
 router = APIRouter()
 
 @router.get("", response_model=List[schemas.CompanyResponse])
-async def get_companies(
+def get_companies(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     company_type: Optional[str] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
@@ -24,22 +28,29 @@ async def get_companies(
     if search:
         query = query.filter(models.Company.name.ilike(f"%{search}%"))
     
-    companies = query.offset(skip).limit(limit).all()
-    return companies
+    companies = paginate(query, models.Company.id, response, skip, limit, cursor)
+    
+    # Unchanged pages skip serialization
+    not_modified = etags.not_modified(request, response, etags.list_etag(companies, request, response, current_user))
+    if not_modified:
+        return not_modified
+    return responses.list_response(responses.COMPANY_LIST, companies, response)
 
 @router.get("/{company_id}", response_model=schemas.CompanyResponse)
-async def get_company(
+def get_company(
     company_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
     company = db.query(models.Company).filter(models.Company.id == company_id).first()
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
-    return company
+    return etags.not_modified(request, response, etags.detail_etag(company)) or company
 
 @router.post("", response_model=schemas.CompanyResponse)
-async def create_company(
+def create_company(
     company_data: schemas.CompanyCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
@@ -59,7 +70,7 @@ async def create_company(
     return db_company
 
 @router.post("/{company_id}/cases/{case_id}")
-async def link_company_to_case(
+def link_company_to_case(
     company_id: int,
     case_id: int,
     relationship_type: Optional[str] = None,
@@ -72,7 +83,7 @@ async def link_company_to_case(
         raise HTTPException(status_code=404, detail="Case not found")
     
     from app import utils
-    if not utils.can_access_case(current_user, case):
+    if not utils.can_access_case(db, current_user, case.id):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     # Check if company exists
@@ -98,7 +109,7 @@ async def link_company_to_case(
     return {"message": "Company linked to case"}
 
 @router.delete("/{company_id}/cases/{case_id}")
-async def unlink_company_from_case(
+def unlink_company_from_case(
     company_id: int,
     case_id: int,
     db: Session = Depends(get_db),
@@ -110,7 +121,7 @@ async def unlink_company_from_case(
         raise HTTPException(status_code=404, detail="Case not found")
     
     from app import utils
-    if not utils.can_access_case(current_user, case):
+    if not utils.can_access_case(db, current_user, case.id):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     case_company = db.query(models.CaseCompany).filter(
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import select, func, case, and_, true
+from sqlalchemy.orm import Session
+from datetime import date
+import os
+from app.database import get_db
+from app import models, schemas, auth, utils
+from app.cache import TTLCache
+from app.models import UserRole, CaseStatus, TaskStatus
+
+router = APIRouter()
+
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "30"))
+
+# Firm-wide numbers are identical for every owner, so one entry serves them all
+firm_stats_cache = TTLCache("dashboard_stats", maxsize=1, ttl=DASHBOARD_CACHE_TTL_SECONDS)
+
+def compute_stats(db: Session, user: models.User) -> schemas.DashboardStats:
+    """Compute dashboard numbers for a user's scope in one aggregate query"""
+    today = date.today()
+    case_ids = utils.accessible_case_ids(user)
+
+    # Same role scoping as get_cases / get_tasks: the accessible_case_ids
+    # subquery is embedded in the aggregate, so access is read from the
+    # database in the same statement
+    case_scope = []
+    task_scope = []
+    if case_ids is not None:
+        case_scope.append(models.Case.id.in_(case_ids))
+    if user.role == UserRole.ASSISTANT:
+        task_scope.append(models.Task.assignee_id == user.id)
+    elif user.role == UserRole.LAWYER:
+        task_scope.append(models.Task.case_id.in_(case_ids))
+
+    not_done = models.Task.status != TaskStatus.DONE
+    case_counts = select(
+        func.count().label("total_cases"),
+        func.count(case((models.Case.status != CaseStatus.CLOSED, 1))).label("open_cases"),
+    ).where(*case_scope).subquery()
+    task_counts = select(
+        func.count().label("total_tasks"),
+        func.count(case((and_(models.Task.due_date < today, not_done), 1))).label("overdue_tasks"),
+        func.count(case((and_(models.Task.due_date == today, not_done), 1))).label("tasks_due_today"),
+    ).where(*task_scope).subquery()
+    user_counts = select(
+        func.count().label("active_users"),
+    ).where(models.User.is_active == True).subquery()
+
+    # Each subquery yields exactly one row, so joining them on TRUE returns one row
+    row = db.execute(
+        select(case_counts, task_counts, user_counts).select_from(
+            case_counts.join(task_counts, true()).join(user_counts, true())
+        )
+    ).one()
+    return schemas.DashboardStats(**row._mapping)
+
+@router.get("/stats", response_model=schemas.DashboardStats)
+def get_dashboard_stats(
+    cached: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    # Cached mode only applies to owners' firm-wide numbers
+    if cached and current_user.role == UserRole.OWNER:
+        stats = firm_stats_cache.get("firm")
+        if stats is None:
+            stats = compute_stats(db, current_user)
+            firm_stats_cache.set("firm", stats)
+        return stats
+    return compute_stats(db, current_user)
@@ -1,71 +1,78 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Response
+from fastapi.routing import APIRoute
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from typing import List, Optional
-from datetime import datetime
-import os
-import shutil
 from pathlib import Path
 from app.database import get_db
-from app import models, schemas, auth
+from app import models, schemas, auth, loaders, utils, responses
+from app.storage import UPLOAD_DIR, MAX_UPLOAD_SIZE, UploadTooLarge, get_storage, storage_for
 from app.models import UserRole
+from app.pagination import paginate
+from app.downloads import document_response, media_type_for, redirect_response
 
-router = APIRouter()
+# Room for the multipart boundaries, part headers and form fields around the
+# file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+class UploadSizeRoute(APIRoute):
+    """Rejects a request whose Content-Length is over the upload limit before
+    FastAPI parses the form, which would spool the whole body first.
+
+    Chunked requests carry no length; storage.put still stops those at
+    MAX_UPLOAD_SIZE, but only once the body has been spooled."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            length = request.headers.get("content-length", "")
+            if length.isdigit() and int(length) > MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD:
+                raise HTTPException(status_code=413, detail="File too large")
+            return await handler(request)
+
+        return route_handler
+
+router = APIRouter(route_class=UploadSizeRoute)
 
 # Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-def can_access_document(user: models.User, document: models.Document) -> bool:
+def can_access_document(db: Session, user: models.User, document: models.Document) -> bool:
     """Check if user can access a document"""
-    from app import utils
-    return utils.can_access_case(user, document.case)
+    return utils.can_access_case(db, user, document.case_id)
 
 @router.get("", response_model=List[schemas.DocumentResponse])
-async def get_documents(
+def get_documents(
+    response: Response,
     case_id: Optional[int] = None,
     document_type: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
-    query = db.query(models.Document)
+    query = db.query(models.Document).options(*loaders.document_options())
     
     if case_id:
         query = query.filter(models.Document.case_id == case_id)
         # Check case access
-        case = db.query(models.Case).filter(models.Case.id == case_id).first()
-        if case:
-            from app import utils
-            if not utils.can_access_case(current_user, case):
-                raise HTTPException(status_code=403, detail="Not enough permissions")
+        if not utils.can_access_case(db, current_user, case_id):
+            raise HTTPException(status_code=403, detail="Not enough permissions")
     else:
         # Filter by accessible cases
-        if current_user.role == UserRole.ASSISTANT:
-            query = query.join(models.Case).join(models.CaseAssistant).filter(
-                models.CaseAssistant.assistant_id == current_user.id
-            )
-        elif current_user.role == UserRole.LAWYER:
-            query = query.join(models.Case).filter(
-                or_(
-                    models.Case.primary_attorney_id == current_user.id,
-                    models.Case.id.in_(
-                        db.query(models.CaseAssistant.case_id).filter(
-                            models.CaseAssistant.assistant_id == current_user.id
-                        )
-                    )
-                )
-            )
+        case_ids = utils.accessible_case_ids(current_user)
+        if case_ids is not None:
+            query = query.filter(models.Document.case_id.in_(case_ids))
     
     if document_type:
         query = query.filter(models.Document.document_type == document_type)
     
-    documents = query.offset(skip).limit(limit).all()
-    return documents
+    documents = paginate(query, models.Document.id, response, skip, limit, cursor)
+    return responses.list_response(responses.DOCUMENT_LIST, documents, response)
 
 @router.get("/{document_id}", response_model=schemas.DocumentResponse)
-async def get_document(
+def get_document(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
@@ -74,13 +81,13 @@ async def get_document(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    if not can_access_document(current_user, document):
+    if not can_access_document(db, current_user, document):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     return document
 
 @router.post("", response_model=schemas.DocumentResponse)
-async def upload_document(
+def upload_document(
     case_id: int,
     document_type: Optional[str] = None,
     file: UploadFile = File(...),
@@ -92,27 +99,25 @@ async def upload_document(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
-    from app import utils
-    if not utils.can_access_case(current_user, case):
+    if not utils.can_access_case(db, current_user, case.id):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    # Save file
+    # Save file in the content-addressed store; identical content is stored once
     file_extension = Path(file.filename).suffix
-    file_name = f"{case_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{file_extension}"
-    file_path = UPLOAD_DIR / file_name
+    try:
+        stored = get_storage().put(file.file)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="File too large")
     
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    file_size = file_path.stat().st_size
     file_type = file_extension[1:] if file_extension else None
     
     db_document = models.Document(
         name=file.filename,
-        file_path=str(file_path),
+        file_path=stored.locator,
         file_type=file_type,
         document_type=document_type,
-        file_size=file_size,
+        file_size=stored.size,
+        sha256=stored.sha256,
         case_id=case_id,
         uploaded_by_id=current_user.id
     )
@@ -122,8 +127,9 @@ async def upload_document(
     return db_document
 
 @router.get("/{document_id}/download")
-async def download_document(
+def download_document(
     document_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
@@ -131,21 +137,24 @@ async def download_document(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    if not can_access_document(current_user, document):
+    if not can_access_document(db, current_user, document):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    if not os.path.exists(document.file_path):
+    backend = storage_for(document.file_path)
+    if not backend.exists(document.file_path):
         raise HTTPException(status_code=404, detail="File not found on server")
     
-    from fastapi.responses import FileResponse
-    return FileResponse(
-        document.file_path,
-        filename=document.name,
-        media_type='application/octet-stream'
-    )
+    local_path = backend.local_path(document.file_path)
+    if local_path is None:
+        # Object storage: the client fetches the bytes directly from the bucket
+        url = backend.presigned_url(document.file_path, document.name, media_type_for(document.file_type))
+        return redirect_response(request, document, url)
+    
+    # Supports Range / If-Range resumption and ETag / Last-Modified revalidation
+    return document_response(request, document, local_path)
 
 @router.delete("/{document_id}")
-async def delete_document(
+def delete_document(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
@@ -154,18 +163,25 @@ async def delete_document(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    if not can_access_document(current_user, document):
+    if not can_access_document(db, current_user, document):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     # Only owners and uploaders can delete
     if current_user.role != UserRole.OWNER and document.uploaded_by_id != current_user.id:
         raise HTTPException(status_code=403, detail="Only document uploader or owner can delete")
     
-    # Delete file
-    if os.path.exists(document.file_path):
-        os.remove(document.file_path)
-    
+    file_path, sha256 = document.file_path, document.sha256
     db.delete(document)
     db.commit()
+    
+    # Blobs are shared by digest and may be matched by an upload at any
+    # moment, so unreferenced ones are left to relink_documents.py --gc,
+    # which only collects them after a grace period. Files from before the
+    # blob store are never shared and can go once unreferenced.
+    backend = storage_for(file_path)
+    if not (sha256 and file_path == backend.locator_for(sha256)):
+        still_used = db.query(models.Document.id).filter(models.Document.file_path == file_path).first()
+        if not still_used:
+            backend.delete(file_path)
     return {"message": "Document deleted"}
 
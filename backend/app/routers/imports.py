@@ -0,0 +1,38 @@
+import io
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.database import get_db
+from app import models, schemas, importer
+from app.auth import require_role
+from app.models import UserRole
+
+router = APIRouter()
+
+@router.post("/{entity}", response_model=schemas.ImportResult)
+def import_records(
+    entity: str,
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role([UserRole.OWNER, UserRole.LAWYER]))
+):
+    """Import clients, companies or cases from a CSV or NDJSON file.
+
+    Rows that fail validation or reference unknown clients, companies or
+    attorneys are reported by line number; the rest are imported.
+    """
+    if entity not in importer.ENTITIES:
+        raise HTTPException(status_code=404, detail=f"Unknown import type: {entity}")
+    fmt = format or importer.format_for(file.filename)
+    if fmt not in importer.FORMATS:
+        raise HTTPException(status_code=400, detail="Format must be csv or ndjson")
+    
+    # The upload is spooled to disk by the framework and read back line by line
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return importer.import_stream(db, entity, stream, fmt, user=current_user)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    finally:
+        stream.detach()
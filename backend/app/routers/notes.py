@@ -1,19 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
-from app import models, schemas, auth
+from app import models, schemas, auth, loaders, utils, etags, responses
 from app.models import UserRole
 
 router = APIRouter()
 
-def can_access_note(user: models.User, note: models.Note) -> bool:
+def can_access_note(db: Session, user: models.User, note: models.Note) -> bool:
     """Check if user can access a note"""
-    from app import utils
-    return utils.can_access_case(user, note.case)
+    return utils.can_access_case(db, user, note.case_id)
 
 @router.get("", response_model=List[schemas.NoteResponse])
-async def get_notes(
+def get_notes(
+    request: Request,
+    response: Response,
     case_id: int,
     pinned_only: bool = False,
     skip: int = 0,
@@ -26,8 +27,7 @@ async def get_notes(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
-    from app import utils
-    if not utils.can_access_case(current_user, case):
+    if not utils.can_access_case(db, current_user, case.id):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     query = db.query(models.Note).filter(models.Note.case_id == case_id)
@@ -35,12 +35,20 @@ async def get_notes(
     if pinned_only:
         query = query.filter(models.Note.is_pinned == True)
     
+    query = query.options(*loaders.note_options())
     notes = query.order_by(models.Note.is_pinned.desc(), models.Note.created_at.desc()).offset(skip).limit(limit).all()
-    return notes
+    
+    # Unchanged pages skip serialization
+    not_modified = etags.not_modified(request, response, etags.list_etag(notes, request, response, current_user, *etags.NOTE_NESTED))
+    if not_modified:
+        return not_modified
+    return responses.list_response(responses.NOTE_LIST, notes, response)
 
 @router.get("/{note_id}", response_model=schemas.NoteResponse)
-async def get_note(
+def get_note(
     note_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
@@ -48,13 +56,13 @@ async def get_note(
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
     
-    if not can_access_note(current_user, note):
+    if not can_access_note(db, current_user, note):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    return note
+    return etags.not_modified(request, response, etags.detail_etag(note, *etags.NOTE_NESTED)) or note
 
 @router.post("", response_model=schemas.NoteResponse)
-async def create_note(
+def create_note(
     note_data: schemas.NoteCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
@@ -64,8 +72,7 @@ async def create_note(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
-    from app import utils
-    if not utils.can_access_case(current_user, case):
+    if not utils.can_access_case(db, current_user, case.id):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     db_note = models.Note(
@@ -80,7 +87,7 @@ async def create_note(
     return db_note
 
 @router.put("/{note_id}", response_model=schemas.NoteResponse)
-async def update_note(
+def update_note(
     note_id: int,
     note_data: schemas.NoteUpdate,
     db: Session = Depends(get_db),
@@ -90,7 +97,7 @@ async def update_note(
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
     
-    if not can_access_note(current_user, note):
+    if not can_access_note(db, current_user, note):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     # Only note author or owner can edit
@@ -111,7 +118,7 @@ async def update_note(
     return note
 
 @router.delete("/{note_id}")
-async def delete_note(
+def delete_note(
     note_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
@@ -120,7 +127,7 @@ async def delete_note(
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
     
-    if not can_access_note(current_user, note):
+    if not can_access_note(db, current_user, note):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     # Only note author or owner can delete
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_db
+from app import models, schemas, auth, search as search_index
+
+router = APIRouter()
+
+@router.get("", response_model=List[schemas.SearchResult])
+def search(
+    q: str = Query(..., min_length=1),
+    types: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    # Comma-separated subset of case, client, company, note
+    kinds = None
+    if types:
+        kinds = [kind.strip() for kind in types.split(",") if kind.strip()]
+        unknown = set(kinds) - set(search_index.SEARCH_TARGETS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown search types: {', '.join(sorted(unknown))}")
+    
+    try:
+        return search_index.search(db, q, current_user, kinds, limit)
+    except search_index.SearchUnsupported as error:
+        raise HTTPException(status_code=501, detail=str(error))
+    except search_index.SearchIndexMissing as error:
+        raise HTTPException(status_code=503, detail=str(error))
@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import and_, func, insert
 from typing import List, Optional
 from datetime import date, datetime
 from app.database import get_db
-from app import models, schemas, auth
+from app import models, schemas, auth, loaders, utils, exports, etags, responses
+from app.pagination import paginate
 from app.models import UserRole
 
 router = APIRouter()
 
-def can_access_task(user: models.User, task: models.Task) -> bool:
+def can_access_task(db: Session, user: models.User, task: models.Task) -> bool:
     """Check if user can access a task"""
     if user.role == UserRole.OWNER:
         return True
@@ -18,40 +19,27 @@ def can_access_task(user: models.User, task: models.Task) -> bool:
     if task.created_by_id == user.id:
         return True
     # Check if user can access the case
-    from app import utils
-    return utils.can_access_case(user, task.case)
+    return utils.can_access_case(db, user, task.case_id)
 
-@router.get("", response_model=List[schemas.TaskResponse])
-async def get_tasks(
-    skip: int = 0,
-    limit: int = 100,
+def filter_tasks(
+    query,
+    user: models.User,
+    case_ids,
     status: Optional[str] = None,
     assignee_id: Optional[int] = None,
     case_id: Optional[int] = None,
     priority: Optional[str] = None,
     overdue_only: bool = False,
     due_today: bool = False,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.get_current_active_user)
 ):
-    query = db.query(models.Task)
-    
+    """Role scoping (`case_ids` from utils.accessible_case_ids) and list filters"""
     # Filter by role
-    if current_user.role == UserRole.ASSISTANT:
+    if user.role == UserRole.ASSISTANT:
         # Assistants only see tasks assigned to them
-        query = query.filter(models.Task.assignee_id == current_user.id)
-    elif current_user.role == UserRole.LAWYER:
+        query = query.filter(models.Task.assignee_id == user.id)
+    elif user.role == UserRole.LAWYER:
         # Lawyers see tasks in their cases
-        query = query.join(models.Case).filter(
-            or_(
-                models.Case.primary_attorney_id == current_user.id,
-                models.Case.id.in_(
-                    db.query(models.CaseAssistant.case_id).filter(
-                        models.CaseAssistant.assistant_id == current_user.id
-                    )
-                )
-            )
-        )
+        query = query.filter(models.Task.case_id.in_(case_ids))
     # Owners see all tasks (no filter)
     
     # Apply filters
@@ -74,13 +62,92 @@ async def get_tasks(
     if due_today:
         today = date.today()
         query = query.filter(models.Task.due_date == today)
+    return query
+
+def scoped_case_ids(user: models.User):
+    # Only lawyers' task visibility depends on case access
+    return utils.accessible_case_ids(user) if user.role == UserRole.LAWYER else None
+
+@router.get("", response_model=List[schemas.TaskResponse])
+def get_tasks(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    assignee_id: Optional[int] = None,
+    case_id: Optional[int] = None,
+    priority: Optional[str] = None,
+    overdue_only: bool = False,
+    due_today: bool = False,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    query = filter_tasks(
+        db.query(models.Task), current_user, scoped_case_ids(current_user),
+        status, assignee_id, case_id, priority, overdue_only, due_today,
+    )
     
-    tasks = query.offset(skip).limit(limit).all()
-    return tasks
+    query = query.options(*loaders.task_options())
+    tasks = paginate(query, models.Task.id, response, skip, limit, cursor)
+    
+    # Unchanged pages skip serialization
+    etag = etags.list_etag(tasks, request, response, current_user, *etags.TASK_NESTED)
+    not_modified = etags.not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+    return responses.list_response(responses.TASK_LIST, tasks, response)
+
+@router.get("/export")
+def export_tasks(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    status: Optional[str] = None,
+    assignee_id: Optional[int] = None,
+    case_id: Optional[int] = None,
+    priority: Optional[str] = None,
+    overdue_only: bool = False,
+    due_today: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Every matching task as flat CSV or NDJSON rows, streamed"""
+    case_ids = scoped_case_ids(current_user)
+    
+    def build_query(export_db: Session):
+        query = (
+            export_db.query(
+                models.Task.id,
+                models.Task.title,
+                models.Task.description,
+                models.Task.status,
+                models.Task.priority,
+                models.Task.due_date,
+                models.Task.case_id,
+                models.Case.case_number,
+                models.Task.assignee_id,
+                models.User.email.label("assignee_email"),
+                models.Task.created_by_id,
+                models.Task.created_at,
+                models.Task.updated_at,
+                models.Task.completed_at,
+            )
+            .join(models.Case, models.Case.id == models.Task.case_id)
+            .outerjoin(models.User, models.User.id == models.Task.assignee_id)
+        )
+        query = filter_tasks(
+            query, current_user, case_ids,
+            status, assignee_id, case_id, priority, overdue_only, due_today,
+        )
+        return query.order_by(models.Task.id)
+    
+    return exports.export_response(build_query, format, "tasks")
 
 @router.get("/{task_id}", response_model=schemas.TaskResponse)
-async def get_task(
+def get_task(
     task_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
@@ -88,13 +155,13 @@ async def get_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    if not can_access_task(current_user, task):
+    if not can_access_task(db, current_user, task):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    return task
+    return etags.not_modified(request, response, etags.detail_etag(task, *etags.TASK_NESTED)) or task
 
 @router.post("", response_model=schemas.TaskResponse)
-async def create_task(
+def create_task(
     task_data: schemas.TaskCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
@@ -107,8 +174,7 @@ async def create_task(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
-    from app import utils
-    if not utils.can_access_case(current_user, case):
+    if not utils.can_access_case(db, current_user, case.id):
         raise HTTPException(status_code=403, detail="Not enough permissions to create task in this case")
     
     # Only owners and lawyers can create tasks
@@ -136,7 +202,7 @@ async def create_task(
     return db_task
 
 @router.put("/{task_id}", response_model=schemas.TaskResponse)
-async def update_task(
+def update_task(
     task_id: int,
     task_data: schemas.TaskUpdate,
     db: Session = Depends(get_db),
@@ -146,7 +212,7 @@ async def update_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    if not can_access_task(current_user, task):
+    if not can_access_task(db, current_user, task):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     # Assistants can only update status and description
@@ -183,7 +249,7 @@ async def update_task(
     return task
 
 @router.delete("/{task_id}")
-async def delete_task(
+def delete_task(
     task_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
@@ -192,7 +258,7 @@ async def delete_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    if not can_access_task(current_user, task):
+    if not can_access_task(db, current_user, task):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     # Only owners and task creators can delete
@@ -203,3 +269,133 @@ async def delete_task(
     db.commit()
     return {"message": "Task deleted"}
 
+
+@router.post("/bulk", response_model=schemas.TaskBulkResponse)
+def bulk_tasks(
+    operations: schemas.TaskBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Create, transition, reassign and delete many tasks in one transaction.
+
+    Permissions match the single-task endpoints; everything is validated
+    up front, so the request either applies completely or not at all.
+    """
+    is_owner = current_user.role == UserRole.OWNER
+    is_assistant = current_user.role == UserRole.ASSISTANT
+    if is_assistant and (operations.create or operations.reassign):
+        raise HTTPException(status_code=403, detail="Assistants can only change the status of their own tasks")
+    
+    # Every referenced task, in one query
+    task_ids = set(operations.delete)
+    for change in operations.status + operations.reassign:
+        task_ids.update(change.task_ids)
+    tasks = {}
+    if task_ids:
+        tasks = {
+            row.id: row for row in
+            db.query(models.Task.id, models.Task.case_id, models.Task.assignee_id, models.Task.created_by_id)
+            .filter(models.Task.id.in_(task_ids))
+        }
+        missing = task_ids - tasks.keys()
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Tasks not found: {', '.join(map(str, sorted(missing)))}")
+    
+    new_case_ids = {task.case_id for task in operations.create}
+    if new_case_ids:
+        found = {row.id for row in db.query(models.Case.id).filter(models.Case.id.in_(new_case_ids))}
+        if new_case_ids - found:
+            raise HTTPException(status_code=404, detail=f"Cases not found: {', '.join(map(str, sorted(new_case_ids - found)))}")
+    
+    # One access check covering every case involved
+    allowed_cases = utils.accessible_cases(db, current_user, new_case_ids | {row.case_id for row in tasks.values()})
+    
+    denied = new_case_ids - allowed_cases
+    if denied:
+        raise HTTPException(status_code=403, detail=f"Not enough permissions to create task in case {min(denied)}")
+    
+    for task_id in task_ids:
+        row = tasks[task_id]
+        if not (is_owner or row.assignee_id == current_user.id or row.created_by_id == current_user.id
+                or row.case_id in allowed_cases):
+            raise HTTPException(status_code=403, detail=f"Not enough permissions for task {task_id}")
+    if is_assistant:
+        for change in operations.status:
+            for task_id in change.task_ids:
+                if tasks[task_id].assignee_id != current_user.id:
+                    raise HTTPException(status_code=403, detail="Can only update your own tasks")
+    if not is_owner:
+        for task_id in operations.delete:
+            if tasks[task_id].created_by_id != current_user.id:
+                raise HTTPException(status_code=403, detail="Only task creator or owner can delete")
+    
+    assignee_ids = {task.assignee_id for task in operations.create if task.assignee_id}
+    assignee_ids |= {change.assignee_id for change in operations.reassign if change.assignee_id}
+    if assignee_ids:
+        found = {row.id for row in db.query(models.User.id).filter(models.User.id.in_(assignee_ids))}
+        if assignee_ids - found:
+            raise HTTPException(status_code=400, detail=f"Unknown assignees: {', '.join(map(str, sorted(assignee_ids - found)))}")
+    
+    # Apply: one multi-row INSERT, then one UPDATE / DELETE per operation
+    new_rows = [
+        {
+            "title": task.title,
+            "description": task.description,
+            "status": task.status,
+            "priority": task.priority,
+            "due_date": task.due_date,
+            "case_id": task.case_id,
+            # Lawyers' unassigned tasks default to themselves, as in create_task
+            "assignee_id": task.assignee_id or (current_user.id if current_user.role == UserRole.LAWYER else None),
+            "created_by_id": current_user.id,
+        }
+        for task in operations.create
+    ]
+    created_ids = []
+    if new_rows:
+        created_ids = list(db.scalars(
+            insert(models.Task).returning(models.Task.id),
+            new_rows,
+        ))
+    
+    updated = set()
+    for change in operations.status:
+        values = {models.Task.status: change.status}
+        # completed_at follows update_task: assistants stamp every completion,
+        # owners and lawyers keep the first one and clear it when reopening
+        if change.status == models.TaskStatus.DONE:
+            values[models.Task.completed_at] = (
+                datetime.utcnow() if is_assistant
+                else func.coalesce(models.Task.completed_at, datetime.utcnow())
+            )
+        elif not is_assistant:
+            values[models.Task.completed_at] = None
+        db.query(models.Task).filter(models.Task.id.in_(change.task_ids)).update(values, synchronize_session=False)
+        updated.update(change.task_ids)
+    
+    for change in operations.reassign:
+        db.query(models.Task).filter(models.Task.id.in_(change.task_ids)).update(
+            {models.Task.assignee_id: change.assignee_id}, synchronize_session=False
+        )
+        updated.update(change.task_ids)
+    
+    deleted = 0
+    if operations.delete:
+        deleted = (
+            db.query(models.Task)
+            .filter(models.Task.id.in_(set(operations.delete)))
+            .delete(synchronize_session=False)
+        )
+    
+    db.commit()
+    
+    created = []
+    if created_ids:
+        created = (
+            db.query(models.Task)
+            .options(*loaders.task_options())
+            .filter(models.Task.id.in_(created_ids))
+            .order_by(models.Task.id)
+            .all()
+        )
+    return {"created": created, "updated": len(updated - set(operations.delete)), "deleted": deleted}
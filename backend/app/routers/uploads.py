@@ -0,0 +1,182 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from pathlib import Path
+from app.database import get_db
+from app import models, schemas, auth, utils, uploads
+from app.storage import MAX_UPLOAD_SIZE, UploadTooLarge, get_storage
+
+router = APIRouter()
+
+# Chunk bodies arrive in small pieces; batch them into fewer disk writes
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+def session_response(session: uploads.UploadSession) -> schemas.UploadSessionResponse:
+    received = session.received()
+    return schemas.UploadSessionResponse(
+        id=session.id,
+        case_id=session.meta["case_id"],
+        filename=session.meta["filename"],
+        size=session.size,
+        chunk_size=session.chunk_size,
+        chunk_count=session.chunk_count,
+        received=received,
+        offset=session.offset(received),
+        expires_at=session.expires_at(),
+    )
+
+def get_session(session_id: str, user: models.User) -> uploads.UploadSession:
+    session = uploads.load_session(session_id)
+    # Sessions belong to whoever created them
+    if not session or session.meta["user_id"] != user.id:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return session
+
+@router.post("", response_model=schemas.UploadSessionResponse)
+def create_upload(
+    upload: schemas.UploadSessionCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    case = db.query(models.Case).filter(models.Case.id == upload.case_id).first()
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+
+    if not utils.can_access_case(db, current_user, case.id):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    if upload.size < 0:
+        raise HTTPException(status_code=400, detail="Invalid size")
+    if upload.size > MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail="File too large")
+    chunk_size = upload.chunk_size or uploads.DEFAULT_CHUNK_SIZE
+    if not uploads.MIN_CHUNK_SIZE <= chunk_size <= uploads.MAX_CHUNK_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"chunk_size must be between {uploads.MIN_CHUNK_SIZE} and {uploads.MAX_CHUNK_SIZE} bytes",
+        )
+
+    # Abandoned sessions are cleaned up as new ones are opened
+    uploads.remove_stale_sessions()
+    session = uploads.create_session(
+        current_user.id, case.id, upload.filename, upload.size, chunk_size,
+        document_type=upload.document_type, sha256=upload.sha256,
+    )
+    return session_response(session)
+
+@router.get("/{session_id}", response_model=schemas.UploadSessionResponse)
+def get_upload(
+    session_id: str,
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    # Clients resume by sending every chunk not yet listed in `received`
+    return session_response(get_session(session_id, current_user))
+
+@router.put("/{session_id}/chunks/{index}")
+async def upload_chunk(
+    session_id: str,
+    index: int,
+    request: Request,
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    session = await run_in_threadpool(get_session, session_id, current_user)
+    if not 0 <= index < session.chunk_count:
+        raise HTTPException(status_code=400, detail="Chunk index out of range")
+    expected = session.chunk_length(index)
+
+    # Stream the body to disk; file I/O runs in the threadpool
+    try:
+        writer = await run_in_threadpool(session.open_chunk)
+        try:
+            pending = bytearray()
+            async for data in request.stream():
+                if writer.written + len(pending) + len(data) > expected:
+                    raise HTTPException(status_code=400, detail=f"Chunk {index} must be {expected} bytes")
+                pending += data
+                if len(pending) >= WRITE_BUFFER_SIZE:
+                    await run_in_threadpool(writer.write, bytes(pending))
+                    pending.clear()
+            if pending:
+                await run_in_threadpool(writer.write, bytes(pending))
+            if writer.written != expected:
+                raise HTTPException(status_code=400, detail=f"Chunk {index} must be {expected} bytes")
+            await run_in_threadpool(writer.commit, index)
+        except BaseException:
+            await run_in_threadpool(writer.abort)
+            raise
+    except FileNotFoundError:
+        # The session directory was claimed for completion or cancelled
+        # while this chunk was arriving
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return {"index": index, "size": expected}
+
+@router.post("/{session_id}/complete", response_model=schemas.DocumentResponse)
+def complete_upload(
+    session_id: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    session = get_session(session_id, current_user)
+    missing = session.missing()
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing chunks: {', '.join(map(str, missing[:20]))}")
+
+    # Access may have changed since the session was opened
+    case_id = session.meta["case_id"]
+    if not utils.can_access_case(db, current_user, case_id):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    claimed = uploads.claim_session(session)
+    if not claimed:
+        raise HTTPException(status_code=409, detail="Upload is already being completed")
+
+    try:
+        # Chunks are streamed in order into the storage backend, never held in memory
+        with claimed.reader() as source:
+            stored = get_storage().put(source, max_size=MAX_UPLOAD_SIZE)
+    except UploadTooLarge:
+        uploads.release_session(claimed)
+        raise HTTPException(status_code=413, detail="File too large")
+    except BaseException:
+        uploads.release_session(claimed)
+        raise
+
+    expected_sha256 = claimed.meta["sha256"]
+    if stored.size != claimed.size or (expected_sha256 and stored.sha256 != expected_sha256):
+        # The blob may already be shared with a concurrent upload of the same
+        # content; if nothing references it, blob GC removes it
+        uploads.remove_session(claimed)
+        raise HTTPException(status_code=400, detail="Uploaded content does not match the declared size or checksum")
+
+    filename = claimed.meta["filename"]
+    file_extension = Path(filename).suffix
+    db_document = models.Document(
+        name=filename,
+        file_path=stored.locator,
+        file_type=file_extension[1:] if file_extension else None,
+        document_type=claimed.meta["document_type"],
+        file_size=stored.size,
+        sha256=stored.sha256,
+        case_id=case_id,
+        uploaded_by_id=current_user.id
+    )
+    db.add(db_document)
+    try:
+        db.commit()
+    except BaseException:
+        # Keep the chunks so the client can retry; the stored blob is
+        # unreferenced and left to blob GC
+        db.rollback()
+        uploads.release_session(claimed)
+        raise
+    db.refresh(db_document)
+    uploads.remove_session(claimed)
+    return db_document
+
+@router.delete("/{session_id}")
+def cancel_upload(
+    session_id: str,
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    uploads.remove_session(get_session(session_id, current_user))
+    return {"message": "Upload cancelled"}
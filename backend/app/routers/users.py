@@ -9,7 +9,7 @@ from app.models import UserRole
 router = APIRouter()
 
 @router.get("", response_model=List[schemas.UserResponse])
-async def get_users(
+def get_users(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
@@ -19,7 +19,7 @@ async def get_users(
     return users
 
 @router.get("/{user_id}", response_model=schemas.UserResponse)
-async def get_user(
+def get_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
@@ -34,7 +34,7 @@ async def get_user(
     return user
 
 @router.post("", response_model=schemas.UserResponse)
-async def create_user(
+def create_user(
     user_data: schemas.UserCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_role([UserRole.OWNER]))
@@ -58,7 +58,7 @@ async def create_user(
     return db_user
 
 @router.put("/{user_id}", response_model=schemas.UserResponse)
-async def update_user(
+def update_user(
     user_id: int,
     user_data: schemas.UserUpdate,
     db: Session = Depends(get_db),
@@ -76,6 +76,7 @@ async def update_user(
         ).first()
         if existing_user:
             raise HTTPException(status_code=400, detail="Email already registered")
+        auth.invalidate_principal(user.email)
         user.email = user_data.email
     
     if user_data.full_name:
@@ -86,11 +87,12 @@ async def update_user(
         user.is_active = user_data.is_active
     
     db.commit()
+    auth.invalidate_principal(user.email)
     db.refresh(user)
     return user
 
 @router.delete("/{user_id}")
-async def delete_user(
+def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_role([UserRole.OWNER]))
@@ -102,8 +104,10 @@ async def delete_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
+    email = user.email
     db.delete(user)
     db.commit()
+    auth.invalidate_principal(email)
     return {"message": "User deleted"}
 
 
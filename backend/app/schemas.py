@@ -153,6 +153,26 @@ class TaskResponse(TaskBase):
     class Config:
         from_attributes = True
 
+class TaskStatusChange(BaseModel):
+    task_ids: List[int]
+    status: TaskStatus
+
+class TaskReassignment(BaseModel):
+    task_ids: List[int]
+    assignee_id: Optional[int] = None  # None unassigns
+
+class TaskBulkRequest(BaseModel):
+    # Applied in this order, all in one transaction
+    create: List[TaskCreate] = []
+    status: List[TaskStatusChange] = []
+    reassign: List[TaskReassignment] = []
+    delete: List[int] = []
+
+class TaskBulkResponse(BaseModel):
+    created: List[TaskResponse]
+    updated: int
+    deleted: int
+
 # Document Schemas
 class DocumentBase(BaseModel):
     name: str
@@ -167,6 +187,7 @@ class DocumentResponse(DocumentBase):
     file_path: str
     file_type: Optional[str] = None
     file_size: Optional[int] = None
+    sha256: Optional[str] = None
     uploaded_by_id: int
     uploaded_at: datetime
     uploaded_by: Optional[UserResponse] = None
@@ -206,6 +227,43 @@ class DashboardStats(BaseModel):
     tasks_due_today: int
     active_users: int
 
+# Search Schemas
+class SearchResult(BaseModel):
+    type: str  # case, client, company, note
+    id: int
+    title: str
+    snippet: Optional[str] = None  # matched text with <mark> highlights
+    rank: float
+    case_id: Optional[int] = None
 
+# Resumable Upload Schemas
+class UploadSessionCreate(BaseModel):
+    case_id: int
+    filename: str
+    size: int  # total bytes
+    document_type: Optional[str] = None
+    chunk_size: Optional[int] = None  # server default when omitted
+    sha256: Optional[str] = None  # verified on completion when given
 
-
+class UploadSessionResponse(BaseModel):
+    id: str
+    case_id: int
+    filename: str
+    size: int
+    chunk_size: int
+    chunk_count: int
+    received: List[int]  # chunk indexes stored so far
+    offset: int  # bytes received contiguously from the start
+    expires_at: datetime
+
+# Import Schemas
+class ImportRowError(BaseModel):
+    row: int  # line number in the uploaded file
+    error: str
+
+class ImportResult(BaseModel):
+    entity: str
+    processed: int
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]  # first 1000 failures
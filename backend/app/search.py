@@ -0,0 +1,153 @@
+import re
+from typing import Iterable, List, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app import models, schemas, utils
+
+# Searchable entities. Postgres indexes each one with a GIN expression index
+# over to_tsvector(config, ...); SQLite uses an external-content FTS5 table
+# kept in sync by triggers. Both are created by migration 5d2c8e41a7f3, which
+# keeps its own copy of the column lists: change both together.
+SEARCH_TARGETS = {
+    "case": {
+        "table": "cases",
+        "columns": ["title", "case_number", "description"],
+        "title": "t.title",
+        "case_id": "t.id",
+        "config": "english",
+    },
+    "client": {
+        "table": "clients",
+        "columns": ["name", "email", "phone"],
+        "title": "t.name",
+        "case_id": "NULL",
+        "config": "simple",
+    },
+    "company": {
+        "table": "companies",
+        "columns": ["name", "company_type"],
+        "title": "t.name",
+        "case_id": "NULL",
+        "config": "simple",
+    },
+    "note": {
+        "table": "notes",
+        "columns": ["content"],
+        "title": "substr(t.content, 1, 80)",
+        "case_id": "t.case_id",
+        "config": "english",
+    },
+}
+
+class SearchUnsupported(Exception):
+    """Full-text search is not implemented for the database's dialect"""
+
+class SearchIndexMissing(Exception):
+    """The full-text tables have not been created (migration 5d2c8e41a7f3)"""
+
+# Results tied to a case are filtered by the user's case access
+CASE_SCOPED_TYPES = {"case", "note"}
+
+def _pg_text(target, alias: str = "") -> str:
+    prefix = f"{alias}." if alias else ""
+    return " || ' ' || ".join(f"coalesce({prefix}{column}, '')" for column in target["columns"])
+
+def _pg_document(target, alias: str = "") -> str:
+    # Must match the indexed expression (see the migration) exactly for the
+    # GIN index to be used
+    return f"to_tsvector('{target['config']}', {_pg_text(target, alias)})"
+
+# utils.case_access_statement as SQL text, bound to :user_id
+CASE_ACCESS_SQL = (
+    "SELECT id FROM cases WHERE primary_attorney_id = :user_id "
+    "UNION SELECT case_id FROM case_assistants WHERE assistant_id = :user_id"
+)
+
+def _terms(query: str) -> List[str]:
+    # Only word characters reach the query syntax, so user input can't break it
+    return re.findall(r"\w+", query.lower())[:16]
+
+def _pg_statement(target, scoped: bool):
+    scope = f"AND {target['case_id']} IN ({CASE_ACCESS_SQL})" if scoped else ""
+    return text(f"""
+        SELECT id, title, case_id, rank,
+               ts_headline('{target['config']}', body, query,
+                           'StartSel=<mark>, StopSel=</mark>, MaxFragments=1, MaxWords=20, MinWords=8') AS snippet
+        FROM (
+            SELECT t.id, {target['title']} AS title, {target['case_id']} AS case_id,
+                   {_pg_text(target, 't')} AS body, query,
+                   ts_rank({_pg_document(target, 't')}, query) AS rank
+            FROM {target['table']} t, to_tsquery('{target['config']}', :query) query
+            WHERE {_pg_document(target, 't')} @@ query {scope}
+            ORDER BY rank DESC
+            LIMIT :limit
+        ) hits
+    """)
+
+def _sqlite_statement(target, scoped: bool):
+    fts = f"{target['table']}_fts"
+    scope = f"AND {target['case_id']} IN ({CASE_ACCESS_SQL})" if scoped else ""
+    return text(f"""
+        SELECT t.id, {target['title']} AS title, {target['case_id']} AS case_id,
+               -bm25({fts}) AS rank,
+               snippet({fts}, -1, '<mark>', '</mark>', '…', 16) AS snippet
+        FROM {fts} JOIN {target['table']} t ON t.id = {fts}.rowid
+        WHERE {fts} MATCH :query {scope}
+        ORDER BY bm25({fts})
+        LIMIT :limit
+    """)
+
+def search(
+    db: Session,
+    query: str,
+    user: models.User,
+    types: Optional[Iterable[str]] = None,
+    limit: int = 20,
+) -> List[schemas.SearchResult]:
+    """Ranked full-text search across entities.
+
+    Case and note hits outside the cases `user` can access are never returned.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        build = _pg_statement
+        match = " & ".join(f"{term}:*" for term in terms)
+    elif dialect == "sqlite":
+        build = _sqlite_statement
+        match = " ".join(f'"{term}"*' for term in terms)
+    else:
+        raise SearchUnsupported(f"Full-text search is not supported on {dialect}")
+
+    results = []
+    for kind in types or SEARCH_TARGETS:
+        target = SEARCH_TARGETS[kind]
+        scoped = kind in CASE_SCOPED_TYPES and utils.accessible_case_ids(user) is not None
+        params = {"query": match, "limit": limit}
+        statement = build(target, scoped)
+        if scoped:
+            params["user_id"] = user.id
+        try:
+            rows = db.execute(statement, params).all()
+        except OperationalError as error:
+            # Postgres still answers without its GIN index (slowly); SQLite
+            # has nothing to query without the FTS table
+            if f"no such table: {target['table']}_fts" in str(error.orig):
+                raise SearchIndexMissing(f"{target['table']}_fts does not exist; run the migrations") from error
+            raise
+        for row in rows:
+            results.append(schemas.SearchResult(
+                type=kind,
+                id=row.id,
+                title=row.title or "",
+                snippet=row.snippet,
+                rank=float(row.rank or 0),
+                case_id=row.case_id,
+            ))
+
+    results.sort(key=lambda result: result.rank, reverse=True)
+    return results[:limit]
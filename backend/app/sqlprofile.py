@@ -0,0 +1,145 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Record statement counts and database time per request
+SQL_PROFILE = os.getenv("SQL_PROFILE", "true").strip().lower() in ("1", "true", "yes")
+# Debug mode: also report the numbers in X-DB-* response headers
+DEBUG = os.getenv("DEBUG", "false").strip().lower() in ("1", "true", "yes")
+# A request running the same statement more than this many times is flagged
+# as a likely N+1 query
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))
+
+# Request handlers run in worker threads with a copy of the request's
+# context, so the profile set here by the middleware is the same object the
+# engine hooks add to.
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("sql_profile", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+# Runs of bind placeholders, as expanded IN (...) lists produce
+_PLACEHOLDERS = re.compile(r"(?:\?|%\(\w+\)s|%s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+))+")
+
+def fingerprint(statement: str) -> str:
+    """Statement text with literals and IN-list lengths normalized, so the
+    same query with different parameters has the same fingerprint"""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _LITERAL.sub("?", statement)
+    return _PLACEHOLDERS.sub("?, ...", statement)
+
+class RequestProfile:
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.seconds += seconds
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, minimum: int = 2) -> Dict[str, int]:
+        """Fingerprints run at least `minimum` times, most frequent first"""
+        return {sql: count for sql, count in self.fingerprints.most_common() if count >= minimum}
+
+    def n_plus_one(self) -> Dict[str, int]:
+        return self.repeated(SQL_N_PLUS_ONE_THRESHOLD + 1)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context._profile_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    started = getattr(context, "_profile_started", None)
+    if profile is not None and started is not None:
+        profile.record(statement, time.perf_counter() - started)
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements executed on `engine` into the current request's profile"""
+    if SQL_PROFILE:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def _short_hash(sql: str) -> str:
+    return hashlib.sha1(sql.encode()).hexdigest()[:12]
+
+class SQLProfilerMiddleware:
+    """Per-request statement count, database time and repeated statements.
+
+    Every request is logged as one JSON line (at WARNING when a likely N+1
+    is found); in debug mode the totals are also sent as X-DB-Statements and
+    X-DB-Time-Ms headers. Statements run while a streaming body is sent
+    after the headers only reach the log.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not SQL_PROFILE:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if DEBUG:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-statements", str(profile.statements).encode()))
+                    headers.append((b"x-db-time-ms", f"{profile.seconds * 1000:.1f}".encode()))
+                    flagged = profile.n_plus_one()
+                    if flagged:
+                        sql, count = next(iter(flagged.items()))
+                        headers.append((b"x-db-n-plus-one", f"{count}; {_short_hash(sql)}".encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            self._log(scope, status, profile, time.perf_counter() - started)
+
+    def _log(self, scope: Scope, status: int, profile: RequestProfile, seconds: float) -> None:
+        flagged = profile.n_plus_one()
+        level = logging.WARNING if flagged else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        route = scope.get("route")
+        record = {
+            "event": "sql_profile",
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status,
+            "duration_ms": round(seconds * 1000, 1),
+            "db_statements": profile.statements,
+            "db_time_ms": round(profile.seconds * 1000, 1),
+            "repeated": [
+                {"fingerprint": _short_hash(sql), "count": count, "sql": sql[:300]}
+                for sql, count in list(profile.repeated().items())[:5]
+            ],
+            "n_plus_one": bool(flagged),
+        }
+        logger.log(level, json.dumps(record))
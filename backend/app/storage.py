@@ -0,0 +1,322 @@
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "uploads"))
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(2 * 1024 ** 3)))  # bytes
+CHUNK_SIZE = 1024 * 1024
+
+# "local" (sharded directories under UPLOAD_DIR) or "s3" (any S3-compatible
+# service: AWS, MinIO, ...). Credentials come from the usual AWS_* variables.
+# boto3 is only needed for "s3": pip install -r requirements-s3.txt
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").strip().lower()
+S3_BUCKET = os.getenv("S3_BUCKET", "")
+S3_PREFIX = os.getenv("S3_PREFIX", "blobs/")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+S3_REGION = os.getenv("S3_REGION") or None
+S3_PRESIGN_EXPIRES = int(os.getenv("S3_PRESIGN_EXPIRES", "300"))  # seconds
+
+# Unreferenced blobs are only deleted (by relink_documents.py --gc) once
+# untouched for this long. put() refreshes the timestamp of content it
+# reuses, so a blob an upload has just matched cannot be collected before
+# that upload's Document row is committed.
+BLOB_GC_GRACE_SECONDS = int(os.getenv("BLOB_GC_GRACE_SECONDS", "3600"))
+
+# Content-addressed store: each distinct file is kept once, at
+# blobs/<d[0:2]>/<d[2:4]>/<digest>, however many documents reference it
+BLOB_DIR = UPLOAD_DIR / "blobs"
+BLOB_TMP_DIR = BLOB_DIR / "tmp"
+
+class UploadTooLarge(Exception):
+    pass
+
+class StoredFile(NamedTuple):
+    locator: str  # what Document.file_path records
+    size: int
+    sha256: str
+    created: bool  # False when identical content was already stored
+
+def _shard(sha256: str) -> str:
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+def _write_temp(source: BinaryIO, directory: Path, max_size: int) -> Tuple[str, int, str]:
+    """Stream `source` into a new temp file, returning (temp path, size, sha256 hex)"""
+    directory.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(f"File exceeds the {max_size} byte upload limit")
+                digest.update(chunk)
+                buffer.write(chunk)
+            buffer.flush()
+            os.fsync(buffer.fileno())
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path, size, digest.hexdigest()
+
+def _hash_stream(source: BinaryIO, max_size: int) -> Tuple[int, str]:
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_size:
+            raise UploadTooLarge(f"File exceeds the {max_size} byte upload limit")
+        digest.update(chunk)
+    return size, digest.hexdigest()
+
+class LocalStorage:
+    """Blobs in digest-sharded directories on the local filesystem.
+
+    Locators are plain file paths, which also covers files uploaded before
+    the blob store existed.
+    """
+
+    name = "local"
+
+    def __init__(self, root: Path):
+        self.blob_dir = root / "blobs"
+        self.tmp_dir = self.blob_dir / "tmp"
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / _shard(sha256)
+
+    def locator_for(self, sha256: str) -> str:
+        return str(self.blob_path(sha256))
+
+    def _reuse(self, path: Path) -> bool:
+        """Whether the blob at `path` exists; if so its mtime is refreshed"""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put(self, source: BinaryIO, max_size: int = MAX_UPLOAD_SIZE) -> StoredFile:
+        """Store `source`, skipping the write when the content already exists.
+
+        Seekable sources (spooled uploads, files on disk) are hashed first, so
+        known content is never written again.
+        """
+        if source.seekable():
+            start = source.tell()
+            size, digest = _hash_stream(source, max_size)
+            path = self.blob_path(digest)
+            if self._reuse(path):
+                return StoredFile(str(path), size, digest, False)
+            source.seek(start)
+
+        temp_path, size, digest = _write_temp(source, self.tmp_dir, max_size)
+        path = self.blob_path(digest)
+        if self._reuse(path):
+            os.remove(temp_path)
+            return StoredFile(str(path), size, digest, False)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_path, path)
+        return StoredFile(str(path), size, digest, True)
+
+    def local_path(self, locator: str) -> Optional[str]:
+        return locator
+
+    def exists(self, locator: str) -> bool:
+        return os.path.exists(locator)
+
+    def modified(self, locator: str) -> Optional[float]:
+        """Last write (or reuse) time as a Unix timestamp, None if missing"""
+        try:
+            return os.stat(locator).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def open(self, locator: str) -> BinaryIO:
+        return open(locator, "rb")
+
+    def delete(self, locator: str):
+        if os.path.exists(locator):
+            os.remove(locator)
+
+    def presigned_url(self, locator: str, filename: str, media_type: str) -> Optional[str]:
+        return None
+
+    def iter_blobs(self) -> Iterator[Tuple[str, str, float]]:
+        """Yield (sha256, locator, modified timestamp) for every blob"""
+        if not self.blob_dir.exists():
+            return
+        for shard in self.blob_dir.glob("??/??"):
+            for path in shard.iterdir():
+                if path.is_file():
+                    yield path.name, str(path), path.stat().st_mtime
+
+    def remove_stale_temp_files(self, max_age_seconds: float = 3600) -> int:
+        """Delete temp files left behind by interrupted writes"""
+        removed = 0
+        cutoff = time.time() - max_age_seconds
+        if self.tmp_dir.exists():
+            for path in self.tmp_dir.iterdir():
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+        return removed
+
+class S3Storage:
+    """Blobs in an S3-compatible bucket; locators look like s3://bucket/key.
+
+    New blobs go to `bucket`; existing ones are read and deleted in the
+    bucket their locator names, so files stored before S3_BUCKET changed stay
+    reachable. Downloads are meant to go straight to the bucket through
+    presigned URLs. Requires boto3 (requirements-s3.txt).
+    """
+
+    name = "s3"
+
+    def __init__(self, bucket: str, prefix: str = "blobs/", endpoint_url: Optional[str] = None,
+                 region: Optional[str] = None, presign_expires: int = 300, client=None):
+        if client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)")
+            client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.presign_expires = presign_expires
+        self.tmp_dir = BLOB_TMP_DIR
+
+    def _location(self, locator: str) -> Tuple[str, str]:
+        """(bucket, key) of an s3://bucket/key locator"""
+        bucket, _, key = locator.removeprefix("s3://").partition("/")
+        if not locator.startswith("s3://") or not bucket or not key:
+            raise ValueError(f"Not an S3 locator: {locator}")
+        return bucket, key
+
+    def locator_for(self, sha256: str) -> str:
+        return f"s3://{self.bucket}/{self.prefix}{_shard(sha256)}"
+
+    def _head(self, bucket: str, key: str) -> Optional[dict]:
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.head_object(Bucket=bucket, Key=key)
+        except ClientError as error:
+            if error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def _reuse(self, bucket: str, key: str) -> bool:
+        """Whether the object exists; if so its LastModified is refreshed"""
+        if not self._head(bucket, key):
+            return False
+        # An in-place copy is the only way to bump LastModified
+        self.client.copy_object(
+            Bucket=bucket, Key=key, CopySource={"Bucket": bucket, "Key": key},
+            MetadataDirective="REPLACE",
+        )
+        return True
+
+    def put(self, source: BinaryIO, max_size: int = MAX_UPLOAD_SIZE) -> StoredFile:
+        temp_path = None
+        if source.seekable():
+            start = source.tell()
+            size, digest = _hash_stream(source, max_size)
+            source.seek(start)
+        else:
+            # The key depends on the digest, so spool unseekable input first
+            temp_path, size, digest = _write_temp(source, self.tmp_dir, max_size)
+            source = open(temp_path, "rb")
+        try:
+            locator = self.locator_for(digest)
+            bucket, key = self._location(locator)
+            if self._reuse(bucket, key):
+                return StoredFile(locator, size, digest, False)
+            # Multipart upload streamed from the file object
+            self.client.upload_fileobj(source, bucket, key)
+            return StoredFile(locator, size, digest, True)
+        finally:
+            if temp_path:
+                source.close()
+                os.remove(temp_path)
+
+    def local_path(self, locator: str) -> Optional[str]:
+        return None
+
+    def exists(self, locator: str) -> bool:
+        return self._head(*self._location(locator)) is not None
+
+    def modified(self, locator: str) -> Optional[float]:
+        head = self._head(*self._location(locator))
+        return head["LastModified"].timestamp() if head else None
+
+    def open(self, locator: str) -> BinaryIO:
+        bucket, key = self._location(locator)
+        return self.client.get_object(Bucket=bucket, Key=key)["Body"]
+
+    def delete(self, locator: str):
+        bucket, key = self._location(locator)
+        self.client.delete_object(Bucket=bucket, Key=key)
+
+    def presigned_url(self, locator: str, filename: str, media_type: str) -> Optional[str]:
+        from app.downloads import content_disposition
+        bucket, key = self._location(locator)
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": bucket,
+                "Key": key,
+                "ResponseContentDisposition": content_disposition(filename),
+                "ResponseContentType": media_type,
+            },
+            ExpiresIn=self.presign_expires,
+        )
+
+    def iter_blobs(self) -> Iterator[Tuple[str, str, float]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                key = item["Key"]
+                yield key.rsplit("/", 1)[-1], f"s3://{self.bucket}/{key}", item["LastModified"].timestamp()
+
+    def remove_stale_temp_files(self, max_age_seconds: float = 3600) -> int:
+        return local_storage.remove_stale_temp_files(max_age_seconds)
+
+local_storage = LocalStorage(UPLOAD_DIR)
+_configured = None
+
+def get_storage():
+    """The backend new files are written to (STORAGE_BACKEND)"""
+    global _configured
+    if _configured is None:
+        if STORAGE_BACKEND == "s3":
+            _configured = S3Storage(S3_BUCKET, S3_PREFIX, S3_ENDPOINT_URL, S3_REGION, S3_PRESIGN_EXPIRES)
+        elif STORAGE_BACKEND == "local":
+            _configured = local_storage
+        else:
+            raise RuntimeError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+    return _configured
+
+def storage_for(locator: str):
+    """The backend holding an existing file, whatever backend is configured now"""
+    if locator.startswith("s3://"):
+        backend = get_storage()
+        if backend.name != "s3":
+            raise RuntimeError(f"{locator} is stored in S3 but STORAGE_BACKEND is {STORAGE_BACKEND}")
+        return backend
+    return local_storage
@@ -0,0 +1,216 @@
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+from dotenv import load_dotenv
+from app.storage import UPLOAD_DIR
+
+load_dotenv()
+
+# Resumable uploads: each session is a directory holding meta.json and one
+# file per received chunk. Chunks are independent files, so clients can send
+# them in parallel and retry any of them; completion streams them in order
+# into the storage backend.
+UPLOAD_SESSION_DIR = UPLOAD_DIR / "sessions"
+UPLOAD_SESSION_TTL_SECONDS = int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", str(24 * 3600)))
+# Sessions being completed are renamed to .completing-<id>; one left behind by
+# a crashed worker is removed this long after the completion started
+UPLOAD_COMPLETION_TIMEOUT_SECONDS = int(os.getenv("UPLOAD_COMPLETION_TIMEOUT_SECONDS", str(6 * 3600)))
+_COMPLETING_PREFIX = ".completing-"
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+_SESSION_ID = re.compile(r"^[0-9a-f]{32}$")
+_CHUNK_NAME = re.compile(r"^chunk-(\d{6})$")
+
+class UploadSession:
+    def __init__(self, path: Path, meta: dict):
+        self.path = path
+        self.meta = meta
+
+    @property
+    def id(self) -> str:
+        return self.meta["id"]
+
+    @property
+    def size(self) -> int:
+        return self.meta["size"]
+
+    @property
+    def chunk_size(self) -> int:
+        return self.meta["chunk_size"]
+
+    @property
+    def chunk_count(self) -> int:
+        return max(1, -(-self.size // self.chunk_size))
+
+    def chunk_length(self, index: int) -> int:
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+    def chunk_path(self, index: int) -> Path:
+        return self.path / f"chunk-{index:06d}"
+
+    def received(self) -> List[int]:
+        indexes = []
+        for name in os.listdir(self.path):
+            match = _CHUNK_NAME.match(name)
+            if match:
+                indexes.append(int(match.group(1)))
+        return sorted(indexes)
+
+    def missing(self) -> List[int]:
+        received = set(self.received())
+        return [index for index in range(self.chunk_count) if index not in received]
+
+    def offset(self, received: List[int]) -> int:
+        """Bytes received contiguously from the start of the file"""
+        contiguous = 0
+        for index in received:
+            if index != contiguous:
+                break
+            contiguous += 1
+        return min(contiguous * self.chunk_size, self.size)
+
+    def expires_at(self) -> datetime:
+        # Storing a chunk touches the directory, so activity extends the session
+        return datetime.fromtimestamp(self.path.stat().st_mtime + UPLOAD_SESSION_TTL_SECONDS, timezone.utc)
+
+    def open_chunk(self) -> "ChunkWriter":
+        return ChunkWriter(self)
+
+    def reader(self) -> "ChunkReader":
+        return ChunkReader([self.chunk_path(index) for index in range(self.chunk_count)])
+
+def create_session(user_id: int, case_id: int, filename: str, size: int,
+                   chunk_size: int, document_type: Optional[str] = None,
+                   sha256: Optional[str] = None) -> UploadSession:
+    session_id = uuid.uuid4().hex
+    path = UPLOAD_SESSION_DIR / session_id
+    path.mkdir(parents=True)
+    meta = {
+        "id": session_id,
+        "user_id": user_id,
+        "case_id": case_id,
+        "filename": filename,
+        "size": size,
+        "chunk_size": chunk_size,
+        "document_type": document_type,
+        "sha256": sha256.lower() if sha256 else None,
+        "created_at": time.time(),
+    }
+    (path / "meta.json").write_text(json.dumps(meta))
+    return UploadSession(path, meta)
+
+def load_session(session_id: str, path: Optional[Path] = None) -> Optional[UploadSession]:
+    if not _SESSION_ID.match(session_id):
+        return None
+    path = path or UPLOAD_SESSION_DIR / session_id
+    try:
+        meta = json.loads((path / "meta.json").read_text())
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return UploadSession(path, meta)
+
+def claim_session(session: UploadSession) -> Optional[UploadSession]:
+    """Move a session aside for completion; None if another request got there first"""
+    claimed = UPLOAD_SESSION_DIR / f"{_COMPLETING_PREFIX}{session.id}"
+    try:
+        os.rename(session.path, claimed)
+    except FileNotFoundError:
+        return None
+    # The directory's mtime now marks the start of the completion
+    os.utime(claimed)
+    return UploadSession(claimed, session.meta)
+
+def release_session(session: UploadSession):
+    """Put a claimed session back after a failed completion so it can be retried"""
+    path = UPLOAD_SESSION_DIR / session.id
+    os.rename(session.path, path)
+    os.utime(path)
+
+def remove_session(session: UploadSession):
+    shutil.rmtree(session.path, ignore_errors=True)
+
+def remove_stale_sessions(
+    max_age_seconds: float = UPLOAD_SESSION_TTL_SECONDS,
+    completing_max_age_seconds: float = UPLOAD_COMPLETION_TIMEOUT_SECONDS,
+) -> int:
+    """Delete sessions with no activity within `max_age_seconds`, and claimed
+    ones whose completion started more than `completing_max_age_seconds` ago"""
+    removed = 0
+    now = time.time()
+    if UPLOAD_SESSION_DIR.exists():
+        for path in UPLOAD_SESSION_DIR.iterdir():
+            completing = path.name.startswith(_COMPLETING_PREFIX)
+            cutoff = now - (completing_max_age_seconds if completing else max_age_seconds)
+            try:
+                stale = path.is_dir() and path.stat().st_mtime < cutoff
+            except FileNotFoundError:
+                continue  # completed or removed meanwhile
+            if stale:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+    return removed
+
+class ChunkWriter:
+    """Writes one chunk to a temp file, published atomically by commit().
+
+    A retried or duplicate PUT of the same index simply replaces the chunk.
+    """
+
+    def __init__(self, session: UploadSession):
+        self.session = session
+        fd, self.temp_path = tempfile.mkstemp(dir=session.path, prefix=".part-")
+        self.file = os.fdopen(fd, "wb")
+        self.written = 0
+
+    def write(self, data: bytes):
+        self.file.write(data)
+        self.written += len(data)
+
+    def commit(self, index: int):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.temp_path, self.session.chunk_path(index))
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+class ChunkReader(io.RawIOBase):
+    """Reads a sequence of chunk files as one stream, one open file at a time"""
+
+    def __init__(self, paths: List[Path]):
+        self.paths = list(paths)
+        self.current = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while True:
+            if self.current is None:
+                if not self.paths:
+                    return 0
+                self.current = open(self.paths.pop(0), "rb")
+            count = self.current.readinto(buffer)
+            if count:
+                return count
+            self.current.close()
+            self.current = None
+
+    def close(self):
+        if self.current is not None:
+            self.current.close()
+            self.current = None
+        super().close()
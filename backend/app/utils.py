@@ -1,18 +1,42 @@
+from typing import Iterable, Optional, Set
+from sqlalchemy import exists, or_, select, union
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import CompoundSelect
 from app import models
 from app.models import UserRole
 
-def can_access_case(user: models.User, case: models.Case) -> bool:
-    """Check if user can access a case"""
-    if user.role == UserRole.OWNER:
-        return True
-    if case.primary_attorney_id == user.id:
-        return True
-    # Check if user is assigned as assistant
-    for assistant in case.case_assistants:
-        if assistant.assistant_id == user.id:
-            return True
-    return False
+# Case access is always read from the database, never cached in the process:
+# with several workers a per-process cache would keep serving a revoked
+# assignment until it expired. Both checks below are single indexed lookups.
 
+def case_access_statement(user_id: int) -> CompoundSelect:
+    """Cases a user leads as primary attorney or assists on"""
+    return union(
+        select(models.Case.id).where(models.Case.primary_attorney_id == user_id),
+        select(models.CaseAssistant.case_id).where(models.CaseAssistant.assistant_id == user_id),
+    )
 
+def accessible_case_ids(user: models.User) -> Optional[CompoundSelect]:
+    """Subquery of the case ids a user can access, for use with `.in_()`;
+    None for owners (every case)"""
+    if user.role == UserRole.OWNER:
+        return None
+    return case_access_statement(user.id)
 
+def can_access_case(db: Session, user: models.User, case_id: int) -> bool:
+    """Check if user can access a case"""
+    if user.role == UserRole.OWNER:
+        return True
+    return db.scalar(select(or_(
+        exists().where(models.Case.id == case_id, models.Case.primary_attorney_id == user.id),
+        exists().where(models.CaseAssistant.case_id == case_id, models.CaseAssistant.assistant_id == user.id),
+    )))
 
+def accessible_cases(db: Session, user: models.User, case_ids: Iterable[int]) -> Set[int]:
+    """Subset of `case_ids` the user can access"""
+    case_ids = set(case_ids)
+    if user.role == UserRole.OWNER or not case_ids:
+        return case_ids
+    return set(db.scalars(
+        select(models.Case.id).where(models.Case.id.in_(case_ids), models.Case.id.in_(case_access_statement(user.id)))
+    ))
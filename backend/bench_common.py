@@ -0,0 +1,11 @@
+"""
+Helpers shared by the bench_*.py scripts.
+"""
+
+def percentile(values, pct):
+    """Nearest-rank percentile of `values`; 0.0 when there are none"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the CasePilot API.
+Runs a mix of slow requests (large task lists) and fast requests (health
+check) at the same time and reports how much the fast requests are held up
+by the slow ones, plus overall throughput.
+
+With handlers that block the event loop, fast request latency climbs to the
+duration of the slow queries; with threadpool handlers it stays flat.
+
+Run this against a running backend with some data loaded (see seed.py).
+
+Usage:
+    python bench_concurrency.py [--slow 8] [--fast 8] [--duration 15]
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from bench_common import percentile
+
+API_BASE_URL = "http://localhost:8000/api"
+
+def login(email, password):
+    response = requests.post(f"{API_BASE_URL}/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+def worker(url, headers, deadline, latencies, lock):
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = session.get(url, headers=headers)
+        elapsed = time.perf_counter() - start
+        if response.status_code != 200:
+            print(f"❌ {url} returned {response.status_code}")
+            return
+        with lock:
+            latencies.append(elapsed)
+
+def report(name, latencies, duration):
+    if not latencies:
+        print(f"{name:>6}: no completed requests")
+        return
+    print(
+        f"{name:>6}: {len(latencies):6d} req  {len(latencies) / duration:8.1f} req/s  "
+        f"p50 {percentile(latencies, 50) * 1000:7.1f} ms  "
+        f"p95 {percentile(latencies, 95) * 1000:7.1f} ms  "
+        f"p99 {percentile(latencies, 99) * 1000:7.1f} ms  "
+        f"mean {statistics.mean(latencies) * 1000:7.1f} ms"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", default="owner@firm.com")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--slow", type=int, default=8, help="concurrent slow clients")
+    parser.add_argument("--fast", type=int, default=8, help="concurrent fast clients")
+    parser.add_argument("--slow-limit", type=int, default=1000, help="page size for the slow task list")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds to run")
+    args = parser.parse_args()
+
+    try:
+        token = login(args.email, args.password)
+    except requests.exceptions.ConnectionError:
+        print(f"❌ Cannot connect to backend at {API_BASE_URL}")
+        sys.exit(1)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    slow_url = f"{API_BASE_URL}/tasks?limit={args.slow_limit}"
+    fast_url = f"{API_BASE_URL}/health"
+    slow_latencies, fast_latencies = [], []
+    lock = threading.Lock()
+
+    print(f"Running {args.slow} slow + {args.fast} fast clients for {args.duration:.0f}s...")
+    deadline = time.perf_counter() + args.duration
+    with ThreadPoolExecutor(max_workers=args.slow + args.fast) as pool:
+        for _ in range(args.slow):
+            pool.submit(worker, slow_url, headers, deadline, slow_latencies, lock)
+        for _ in range(args.fast):
+            pool.submit(worker, fast_url, {}, deadline, fast_latencies, lock)
+
+    print("=" * 50)
+    report("slow", slow_latencies, args.duration)
+    report("fast", fast_latencies, args.duration)
+    total = len(slow_latencies) + len(fast_latencies)
+    print(f"total: {total / args.duration:.1f} req/s")
+
+if __name__ == "__main__":
+    main()
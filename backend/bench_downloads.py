@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Download offload benchmark for the CasePilot API.
+Downloads one document repeatedly and reports how long the API worker is
+occupied per download versus the full end-to-end transfer time.
+
+Run it twice against a backend serving a large document: once with
+DOWNLOAD_OFFLOAD unset (the worker streams the file) and once with
+DOWNLOAD_OFFLOAD=x-accel-redirect. In offload mode this script plays the
+part of nginx: it follows the X-Accel-Redirect header by fetching the file
+from a local static server rooted at the upload directory.
+
+Usage:
+    python bench_downloads.py --document-id 1 [--requests 50] [--concurrency 8]
+                              [--upload-dir uploads] [--offload-prefix /protected/]
+"""
+
+import argparse
+import functools
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from bench_common import percentile
+
+API_BASE_URL = "http://localhost:8000/api"
+
+def login(email, password):
+    response = requests.post(f"{API_BASE_URL}/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+def start_standin(upload_dir):
+    """Static file server standing in for the proxy's internal location"""
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    handler = functools.partial(QuietHandler, directory=upload_dir)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def download(session, url, headers, standin_url, prefix):
+    """Return (seconds the API spent on the request, total seconds, bytes)"""
+    start = time.perf_counter()
+    response = session.get(url, headers=headers)
+    response.raise_for_status()
+    body = len(response.content)
+    api_done = time.perf_counter()
+
+    redirect = response.headers.get("X-Accel-Redirect")
+    if redirect:
+        internal = session.get(standin_url + "/" + redirect[len(prefix):].lstrip("/"))
+        internal.raise_for_status()
+        body = len(internal.content)
+    return api_done - start, time.perf_counter() - start, body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", default="owner@firm.com")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--document-id", type=int, required=True)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--upload-dir", default="uploads")
+    parser.add_argument("--offload-prefix", default="/protected/")
+    args = parser.parse_args()
+
+    try:
+        token = login(args.email, args.password)
+    except requests.exceptions.ConnectionError:
+        print(f"❌ Cannot connect to backend at {API_BASE_URL}")
+        sys.exit(1)
+
+    standin = start_standin(args.upload_dir)
+    standin_url = f"http://127.0.0.1:{standin.server_address[1]}"
+    url = f"{API_BASE_URL}/documents/{args.document_id}/download"
+    headers = {"Authorization": f"Bearer {token}"}
+    local = threading.local()
+
+    def run(_):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return download(local.session, url, headers, standin_url, args.offload_prefix)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(run, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    standin.shutdown()
+
+    api_times = [api for api, _, _ in results]
+    total_times = [total for _, total, _ in results]
+    transferred = sum(size for _, _, size in results)
+    print("=" * 50)
+    print(f"downloads:        {len(results)} ({transferred / 1024 ** 2:.1f} MiB) in {elapsed:.2f}s")
+    print(f"worker occupancy: mean {statistics.mean(api_times) * 1000:8.1f} ms  "
+          f"p95 {percentile(api_times, 95) * 1000:8.1f} ms  "
+          f"total {sum(api_times):.2f} worker-seconds")
+    print(f"end to end:       mean {statistics.mean(total_times) * 1000:8.1f} ms  "
+          f"p95 {percentile(total_times, 95) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+HTTP load benchmark for the CasePilot API.
+
+Logs in as an owner, a lawyer and an assistant and runs concurrent
+clients for each role against the hot endpoints: the task, case and note
+lists, login, document upload and document download. Every client picks
+endpoints at random from a weighted mix, as real traffic does. The
+report shows p50/p95/p99 latency and throughput per role and endpoint.
+
+Run it against a running backend with a generated dataset (see
+generate_dataset.py); by default it uses that script's accounts. Works the
+same against SQLite or Postgres. Documents uploaded during the run are
+deleted afterwards.
+
+Usage:
+    python bench_load.py [--clients 4] [--duration 30] [--endpoints tasks,cases,notes]
+    python bench_load.py --json results.json   # also save the numbers
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from bench_common import percentile
+
+API_BASE_URL = "http://localhost:8000/api"
+EMAIL_DOMAIN = "synthetic.example.com"
+ROLES = ["owner", "lawyer", "assistant"]
+
+# Relative frequency of each endpoint in the mix; login is rare (and costly)
+MIX = {"tasks": 30, "cases": 25, "notes": 25, "download": 10, "upload": 5, "login": 5}
+
+class RoleClient:
+    """Credentials and request targets for one role"""
+
+    def __init__(self, role, email, password, upload_size):
+        self.role = role
+        self.email = email
+        self.password = password
+        self.upload_size = upload_size
+        self.headers = {}
+        self.case_ids = []
+        self.document_ids = []
+        self.uploaded = []
+        self.lock = threading.Lock()
+
+    def login(self, session):
+        return session.post(f"{API_BASE_URL}/auth/login", json={"email": self.email, "password": self.password})
+
+    def setup(self):
+        response = self.login(requests)
+        if response.status_code != 200:
+            print(f"❌ Login failed for {self.email}: {response.status_code}")
+            sys.exit(1)
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        cases = requests.get(f"{API_BASE_URL}/cases", params={"limit": 200}, headers=self.headers).json()
+        documents = requests.get(f"{API_BASE_URL}/documents", params={"limit": 200}, headers=self.headers).json()
+        self.case_ids = [case["id"] for case in cases]
+        self.document_ids = [document["id"] for document in documents]
+
+    def request(self, session, endpoint):
+        if endpoint == "tasks":
+            return session.get(f"{API_BASE_URL}/tasks", params={"limit": 50}, headers=self.headers)
+        if endpoint == "cases":
+            return session.get(f"{API_BASE_URL}/cases", params={"limit": 50}, headers=self.headers)
+        if endpoint == "notes":
+            params = {"case_id": random.choice(self.case_ids), "limit": 50}
+            return session.get(f"{API_BASE_URL}/notes", params=params, headers=self.headers)
+        if endpoint == "login":
+            return self.login(session)
+        if endpoint == "download":
+            # Storage backends that redirect (S3) are measured up to the redirect
+            url = f"{API_BASE_URL}/documents/{random.choice(self.document_ids)}/download"
+            return session.get(url, headers=self.headers, allow_redirects=False)
+        if endpoint == "upload":
+            # Random content, so every upload stores a new blob
+            files = {"file": ("bench.bin", os.urandom(self.upload_size), "application/octet-stream")}
+            response = session.post(f"{API_BASE_URL}/documents", params={"case_id": random.choice(self.case_ids)},
+                                    files=files, headers=self.headers)
+            if response.status_code == 200:
+                with self.lock:
+                    self.uploaded.append(response.json()["id"])
+            return response
+        raise ValueError(endpoint)
+
+    def endpoints(self, selected):
+        """The selected endpoints this role has something to request from"""
+        targets = {"notes": self.case_ids, "upload": self.case_ids, "download": self.document_ids}
+        return [endpoint for endpoint in selected if targets.get(endpoint, True)]
+
+    def cleanup(self):
+        for document_id in self.uploaded:
+            requests.delete(f"{API_BASE_URL}/documents/{document_id}", headers=self.headers)
+
+def worker(client, endpoints, deadline, results, errors, lock):
+    session = requests.Session()
+    weights = [MIX[endpoint] for endpoint in endpoints]
+    while time.perf_counter() < deadline:
+        endpoint = random.choices(endpoints, weights)[0]
+        start = time.perf_counter()
+        response = client.request(session, endpoint)
+        _ = response.content
+        elapsed = time.perf_counter() - start
+        with lock:
+            if response.status_code < 400:
+                results[(client.role, endpoint)].append(elapsed)
+            else:
+                errors[(client.role, endpoint)] += 1
+
+def report(results, errors, duration):
+    print(f"{'role':<10} {'endpoint':<9} {'req':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    summary = []
+    for role, endpoint in sorted(set(results) | set(errors)):
+        latencies = results.get((role, endpoint), [])
+        row = {
+            "role": role,
+            "endpoint": endpoint,
+            "requests": len(latencies),
+            "throughput": len(latencies) / duration,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "errors": errors.get((role, endpoint), 0),
+        }
+        summary.append(row)
+        print(
+            f"{role:<10} {endpoint:<9} {row['requests']:7d} {row['throughput']:8.1f} "
+            f"{row['p50_ms']:8.1f} {row['p95_ms']:8.1f} {row['p99_ms']:8.1f} {row['errors']:7d}"
+        )
+    total = sum(row["requests"] for row in summary)
+    print(f"total: {total} requests, {total / duration:.1f} req/s")
+    return summary
+
+def main():
+    global API_BASE_URL
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=API_BASE_URL, help="API base URL")
+    for role in ROLES:
+        parser.add_argument(f"--{role}", default=f"{role}1@{EMAIL_DOMAIN}", help=f"{role} account email")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--roles", default=",".join(ROLES), help="comma-separated roles to run")
+    parser.add_argument("--endpoints", default=",".join(MIX), help="comma-separated endpoints to include")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent clients per role")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--upload-size", type=int, default=256 * 1024, help="bytes per uploaded file")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+    API_BASE_URL = args.url.rstrip("/")
+
+    selected = [endpoint for endpoint in args.endpoints.split(",") if endpoint]
+    unknown = set(selected) - set(MIX)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+    roles = [role for role in args.roles.split(",") if role]
+
+    clients = []
+    try:
+        for role in roles:
+            client = RoleClient(role, getattr(args, role), args.password, args.upload_size)
+            client.setup()
+            if client.endpoints(selected):
+                clients.append(client)
+            else:
+                print(f"⚠️  {client.email} has no cases or documents for the selected endpoints; skipping")
+    except requests.exceptions.ConnectionError:
+        print(f"❌ Cannot connect to backend at {API_BASE_URL}")
+        sys.exit(1)
+
+    if not clients:
+        sys.exit(1)
+
+    results, errors = defaultdict(list), defaultdict(int)
+    lock = threading.Lock()
+    print(f"Running {args.clients} clients per role ({', '.join(roles)}) for {args.duration:.0f}s...")
+    deadline = time.perf_counter() + args.duration
+    try:
+        with ThreadPoolExecutor(max_workers=args.clients * len(clients)) as pool:
+            futures = [
+                pool.submit(worker, client, client.endpoints(selected), deadline, results, errors, lock)
+                for client in clients for _ in range(args.clients)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        for client in clients:
+            client.cleanup()
+
+    print("=" * 74)
+    summary = report(results, errors, args.duration)
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump({"duration": args.duration, "clients_per_role": args.clients, "results": summary}, output, indent=2)
+        print(f"📄 Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for large list responses.
+Builds 1,000 tasks (each with its case, client and users attached, as the
+list endpoint loads them) and times turning them into a JSON response body:
+
+  response_model   FastAPI's generic path: validate against response_model,
+                   then render with the stdlib JSONResponse (the old default)
+  + orjson         the same, rendered with ORJSONResponse (the new default)
+  TypeAdapter      app.responses.list_response: a prebuilt TypeAdapter, each
+                   distinct nested row (case, client, user) validated once,
+                   dumped straight to JSON bytes by pydantic-core
+
+No database or running server is needed.
+
+Usage:
+    python bench_serialization.py [--tasks 1000] [--rounds 20]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import date, datetime, timezone
+from typing import List
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app import models, responses, schemas
+
+def build_tasks(count):
+    now = datetime.now(timezone.utc)
+    lawyer = models.User(id=2, email="lawyer@firm.com", full_name="Sarah Lawyer", role=models.UserRole.LAWYER,
+                         is_active=True, created_at=now)
+    owner = models.User(id=1, email="owner@firm.com", full_name="John Owner", role=models.UserRole.OWNER,
+                        is_active=True, created_at=now)
+    tasks = []
+    for case_index in range(count // 10):
+        client = models.Client(id=case_index + 1, name=f"Client {case_index}", email=f"c{case_index}@example.com",
+                               phone="555-0100", address="1 Main St", is_active=True, created_at=now)
+        case = models.Case(id=case_index + 1, case_number=f"CASE-2024-{case_index:08d}", title=f"Case {case_index}",
+                           description="Personal injury claim", case_type="injury", status=models.CaseStatus.OPEN,
+                           client_id=client.id, client=client, primary_attorney_id=lawyer.id,
+                           primary_attorney=lawyer, opened_date=date(2024, 1, 1), created_at=now)
+        for task_index in range(10):
+            tasks.append(models.Task(
+                id=len(tasks) + 1, title=f"Task {task_index}", description="Request medical records",
+                status=models.TaskStatus.TODO, priority=models.TaskPriority.MEDIUM, due_date=date(2024, 6, 1),
+                case_id=case.id, case=case, assignee_id=lawyer.id, assignee=lawyer,
+                created_by_id=owner.id, creator=owner, created_at=now,
+            ))
+    return tasks
+
+def generic(tasks, response_class):
+    field = create_response_field(name="Response", type_=List[schemas.TaskResponse], mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=tasks, is_coroutine=True))
+    return response_class(content).body
+
+def fast(tasks):
+    return responses.list_response(responses.TASK_LIST, tasks, Response()).body
+
+def timed(label, function, rounds, baseline=None):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        body = function()
+        samples.append(time.perf_counter() - start)
+    median = statistics.median(samples) * 1000
+    speedup = f"  ({baseline / median:.1f}x)" if baseline else ""
+    print(f"{label:<16} median {median:8.2f} ms   min {min(samples) * 1000:8.2f} ms   {len(body) / 1024:7.0f} KiB{speedup}")
+    return median, body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    tasks = build_tasks(args.tasks)
+    print(f"Serializing {len(tasks)} tasks, {args.rounds} rounds")
+    print("=" * 70)
+    baseline, expected = timed("response_model", lambda: generic(tasks, JSONResponse), args.rounds)
+    _, orjson_body = timed("+ orjson", lambda: generic(tasks, ORJSONResponse), args.rounds, baseline)
+    _, fast_body = timed("TypeAdapter", lambda: fast(tasks), args.rounds, baseline)
+    if not json.loads(expected) == json.loads(orjson_body) == json.loads(fast_body):
+        print("❌ Response bodies differ")
+
+if __name__ == "__main__":
+    main()
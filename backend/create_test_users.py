@@ -10,6 +10,7 @@ Usage:
 import requests
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 API_BASE_URL = "http://localhost:8000/api"
 
@@ -85,10 +86,10 @@ def main():
     
     print(f"✅ Backend is running at {API_BASE_URL}\n")
     
-    success_count = 0
-    for user_data in TEST_USERS:
-        if create_user(user_data):
-            success_count += 1
+    # Register concurrently; the server hashes passwords on its bounded pool
+    with ThreadPoolExecutor(max_workers=len(TEST_USERS)) as executor:
+        results = list(executor.map(create_user, TEST_USERS))
+    success_count = sum(results)
     
     print("\n" + "=" * 50)
     print(f"✅ Created {success_count}/{len(TEST_USERS)} users")
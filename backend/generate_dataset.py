@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+"""
+Synthetic dataset generator for load testing CasePilot.
+
+Bulk-inserts users, companies, clients, cases, case assistants, tasks,
+documents and notes with skewed, realistic distributions: a few attorneys
+carry most of the caseload, case sizes vary widely, closed cases have
+finished tasks, open ones have overdue work, and so on.
+
+--scale 1 is production size: 200 users, 80k cases, ~2M tasks, ~5M notes
+and ~500k documents. The default --scale 0.01 builds a quick local
+dataset. Rows are inserted with COPY on Postgres and executemany
+elsewhere; the same --seed always produces the same data.
+
+Every generated user shares one password. Accounts are numbered per role
+(owner1@synthetic.example.com, lawyer1@..., assistant1@...); bench_load.py
+logs in with the first of each by default. Documents point at a small set of real
+blobs in the configured storage, shared by content like uploads are.
+
+Run migrations first (alembic upgrade head).
+
+Usage:
+    cd backend
+    python generate_dataset.py [--scale 0.01] [--seed 42] [--password password]
+"""
+
+import argparse
+import io
+import math
+import random
+import sys
+import time
+from datetime import date, datetime, time as clock, timedelta, timezone
+from sqlalchemy import func, text
+from app.database import SessionLocal
+from app.importer import bulk_insert
+from app.models import (
+    User, Client, Company, Case, CaseAssistant, CaseCompany, Task, Document, Note,
+    UserRole, CaseStatus, TaskStatus, TaskPriority,
+)
+from app.passwords import hash_password
+from app.storage import get_storage
+
+EMAIL_DOMAIN = "synthetic.example.com"
+
+# Sizes at --scale 1
+USERS = 200
+CASES = 80_000
+TASKS_PER_CASE = 25
+NOTES_PER_CASE = 62.5
+DOCUMENTS_PER_CASE = 6
+CASES_PER_CLIENT = 1.3
+CASES_PER_COMPANY = 20
+BLOBS = 24
+
+ROLE_SHARES = [(UserRole.OWNER, 0.02), (UserRole.LAWYER, 0.38), (UserRole.ASSISTANT, 0.60)]
+CASE_STATUSES = [(CaseStatus.OPEN, 35), (CaseStatus.IN_PROGRESS, 30), (CaseStatus.ON_HOLD, 10), (CaseStatus.CLOSED, 25)]
+TASK_STATUSES = [(TaskStatus.TODO, 45), (TaskStatus.IN_PROGRESS, 20), (TaskStatus.DONE, 35)]
+TASK_PRIORITIES = [(TaskPriority.HIGH, 20), (TaskPriority.MEDIUM, 55), (TaskPriority.LOW, 25)]
+ASSISTANTS_PER_CASE = [(0, 20), (1, 50), (2, 25), (3, 5)]
+COMPANIES_PER_CASE = [(0, 30), (1, 45), (2, 20), (3, 5)]
+
+CASE_TYPES = ["Personal Injury", "Medical Malpractice", "Employment Law", "Workers Compensation",
+              "Auto Accident", "Premises Liability", "Product Liability", "Corporate Law"]
+COMPANY_TYPES = ["insurer", "bank", "medical_provider", "employer", "opposing_counsel"]
+DOCUMENT_TYPES = [("Medical Report", "pdf"), ("Legal Document", "pdf"), ("Correspondence", "docx"),
+                  ("Evidence Photo", "jpg"), ("Billing Statement", "pdf"), ("Contract", "docx")]
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David",
+               "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas",
+               "Sarah", "Carlos", "Maria", "Wei", "Aisha", "Olga", "Hiroshi", "Fatima", "Ivan"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+              "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor",
+              "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson", "White", "Harris", "Chen",
+              "Kowalski", "Okafor", "Nguyen", "Petrov", "Shevchenko", "Tanaka"]
+COMPANY_NAMES = ["Mutual", "Capital", "General", "National", "Pacific", "Summit", "Liberty", "Keystone",
+                 "Harbor", "Evergreen", "Pioneer", "Guardian", "Sterling", "Atlas", "Beacon"]
+COMPANY_SUFFIXES = {"insurer": "Insurance Co.", "bank": "Bank", "medical_provider": "Medical Center",
+                    "employer": "Industries", "opposing_counsel": "LLP"}
+TASK_VERBS = ["Draft", "Review", "File", "Request", "Schedule", "Prepare", "Send", "Follow up on", "Finalize"]
+TASK_OBJECTS = ["motion to dismiss", "medical records", "deposition", "discovery responses", "settlement demand",
+                "client intake form", "expert report", "court filing", "insurance claim", "subpoena",
+                "witness list", "mediation brief", "billing records", "police report"]
+NOTE_SENTENCES = [
+    "Spoke with the client about next steps.", "Opposing counsel requested an extension.",
+    "Medical records received and filed.", "Insurance adjuster has not responded yet.",
+    "Hearing moved to next month.", "Client provided additional photos of the scene.",
+    "Need to confirm the expert's availability.", "Settlement offer is below our estimate.",
+    "Discovery deadline is approaching.", "Left a voicemail for the witness.",
+    "Reviewed the police report; no inconsistencies found.", "Billing statement sent to the client.",
+]
+
+def weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+def lognormal_count(rng, mean, sigma=0.9):
+    """Non-negative count with the given mean and a long right tail"""
+    mu = math.log(mean) - sigma ** 2 / 2
+    return int(rng.lognormvariate(mu, sigma))
+
+def moment(rng, start: date, end: date) -> datetime:
+    """Random time of day on a random date between start and end"""
+    day = start + timedelta(days=rng.randint(0, max(0, (end - start).days)))
+    return datetime.combine(day, clock(rng.randint(8, 18), rng.randint(0, 59)), tzinfo=timezone.utc)
+
+class BatchWriter:
+    """Buffers rows for one table and bulk-inserts them in committed batches"""
+
+    def __init__(self, db, model, batch_size):
+        self.db = db
+        self.table = model.__table__
+        self.batch_size = batch_size
+        self.rows = []
+        self.count = 0
+        self.started = time.perf_counter()
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        bulk_insert(self.db, self.table, self.rows)
+        self.db.commit()
+        before, self.count = self.count, self.count + len(self.rows)
+        self.rows = []
+        if before // 100_000 != self.count // 100_000:
+            print(f"   … {self.count:,} {self.table.name}", flush=True)
+
+    def close(self):
+        self.flush()
+        print(f"✅ {self.count:,} {self.table.name} ({time.perf_counter() - self.started:.1f}s)")
+
+class DatasetGenerator:
+    def __init__(self, db, scale, seed, batch_size):
+        self.db = db
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.today = date.today()
+
+    def scaled(self, count, minimum=1):
+        return max(minimum, round(count * self.scale))
+
+    def writer(self, model):
+        return BatchWriter(self.db, model, self.batch_size)
+
+    def new_ids(self, model, after):
+        """Ids of the rows just inserted into `model`, in insertion order"""
+        return [row_id for (row_id,) in self.db.query(model.id).filter(model.id > after).order_by(model.id)]
+
+    def max_id(self, model):
+        return self.db.query(func.max(model.id)).scalar() or 0
+
+    def person(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def create_users(self, password):
+        hashed = hash_password(password)
+        total = self.scaled(USERS, minimum=len(ROLE_SHARES) * 2)
+        users = []
+        for role, share in ROLE_SHARES:
+            for number in range(1, max(1, round(total * share)) + 1):
+                users.append(User(
+                    email=f"{role.value}{number}@{EMAIL_DOMAIN}",
+                    hashed_password=hashed,
+                    full_name=self.person(),
+                    role=role,
+                ))
+        self.db.add_all(users)
+        self.db.commit()
+        self.lawyers = [user.id for user in users if user.role == UserRole.LAWYER]
+        self.assistants = [user.id for user in users if user.role == UserRole.ASSISTANT]
+        # Caseloads are heavy-tailed: a few attorneys carry many cases
+        self.lawyer_weights = [self.rng.paretovariate(1.3) for _ in self.lawyers]
+        # Each attorney works with a small team of assistants
+        self.teams = {
+            lawyer: self.rng.sample(self.assistants, min(len(self.assistants), self.rng.randint(1, 4)))
+            for lawyer in self.lawyers
+        }
+        print(f"✅ {len(users)} users ({len(self.lawyers)} lawyers, {len(self.assistants)} assistants)")
+
+    def create_companies(self):
+        after = self.max_id(Company)
+        companies = self.writer(Company)
+        for _ in range(self.scaled(CASES / CASES_PER_COMPANY)):
+            company_type = self.rng.choice(COMPANY_TYPES)
+            companies.add({
+                "name": f"{self.rng.choice(COMPANY_NAMES)} {self.rng.choice(LAST_NAMES)} {COMPANY_SUFFIXES[company_type]}",
+                "company_type": company_type,
+                "contact_info": f"claims@{self.rng.choice(LAST_NAMES).lower()}.example.com",
+            })
+        companies.close()
+        self.companies = self.new_ids(Company, after)
+
+    def create_clients(self):
+        after = self.max_id(Client)
+        clients = self.writer(Client)
+        for number in range(self.scaled(CASES / CASES_PER_CLIENT)):
+            name = self.person()
+            clients.add({
+                "name": name,
+                "email": f"{name.lower().replace(' ', '.')}{number}@example.com",
+                "phone": f"555-{self.rng.randint(0, 9999):04d}",
+                "address": f"{self.rng.randint(1, 9999)} {self.rng.choice(LAST_NAMES)} St",
+                "is_active": self.rng.random() < 0.95,
+            })
+        clients.close()
+        self.clients = self.new_ids(Client, after)
+
+    def create_cases(self):
+        after = self.max_id(Case)
+        cases = self.writer(Case)
+        plans = []
+        first_day = self.today - timedelta(days=6 * 365)
+        for number in range(self.scaled(CASES)):
+            attorney = self.rng.choices(self.lawyers, self.lawyer_weights)[0]
+            status = weighted(self.rng, CASE_STATUSES)
+            opened = moment(self.rng, first_day, self.today)
+            team = self.teams[attorney]
+            assistants = self.rng.sample(team, min(len(team), weighted(self.rng, ASSISTANTS_PER_CASE)))
+            plans.append((attorney, status, opened.date(), assistants))
+            cases.add({
+                "case_number": f"CASE-{opened.year}-S{number:07d}",
+                "title": f"{self.rng.choice(LAST_NAMES)} v. {self.rng.choice(LAST_NAMES)}",
+                "description": self.rng.choice(NOTE_SENTENCES),
+                "case_type": self.rng.choice(CASE_TYPES),
+                "status": status,
+                "client_id": self.rng.choice(self.clients),
+                "primary_attorney_id": attorney,
+                "opened_date": opened.date(),
+                "next_hearing_date": (self.today + timedelta(days=self.rng.randint(1, 180))
+                                      if status != CaseStatus.CLOSED and self.rng.random() < 0.6 else None),
+                "statute_of_limitations": opened.date() + timedelta(days=self.rng.randint(2, 6) * 365),
+                "created_at": opened,
+            })
+        cases.close()
+        self.cases = list(zip(self.new_ids(Case, after), plans))
+
+    def create_case_links(self):
+        assistants = self.writer(CaseAssistant)
+        companies = self.writer(CaseCompany)
+        for case_id, (_, _, _, case_assistants) in self.cases:
+            for assistant_id in case_assistants:
+                assistants.add({"case_id": case_id, "assistant_id": assistant_id})
+            for company_id in self.rng.sample(self.companies, min(len(self.companies), weighted(self.rng, COMPANIES_PER_CASE))):
+                companies.add({"case_id": case_id, "company_id": company_id,
+                               "relationship_type": self.rng.choice(COMPANY_TYPES)})
+        assistants.close()
+        companies.close()
+
+    def create_tasks(self):
+        tasks = self.writer(Task)
+        for case_id, (attorney, case_status, opened, assistants) in self.cases:
+            people = assistants or [attorney]
+            for _ in range(lognormal_count(self.rng, TASKS_PER_CASE)):
+                closed = case_status == CaseStatus.CLOSED
+                status = TaskStatus.DONE if closed and self.rng.random() < 0.95 else weighted(self.rng, TASK_STATUSES)
+                created = moment(self.rng, opened, self.today)
+                if status == TaskStatus.DONE:
+                    completed = moment(self.rng, created.date(), self.today)
+                    due = completed.date() + timedelta(days=self.rng.randint(-5, 10))
+                else:
+                    completed = None
+                    # Some open work is overdue
+                    due = self.today + timedelta(days=self.rng.randint(-20, 60))
+                tasks.add({
+                    "title": f"{self.rng.choice(TASK_VERBS)} {self.rng.choice(TASK_OBJECTS)}",
+                    "description": self.rng.choice(NOTE_SENTENCES) if self.rng.random() < 0.5 else None,
+                    "status": status,
+                    "priority": weighted(self.rng, TASK_PRIORITIES),
+                    "due_date": due if self.rng.random() < 0.85 else None,
+                    "case_id": case_id,
+                    "assignee_id": self.rng.choice(people) if self.rng.random() < 0.95 else None,
+                    "created_by_id": attorney,
+                    "created_at": created,
+                    "completed_at": completed,
+                })
+        tasks.close()
+
+    def create_blobs(self):
+        storage = get_storage()
+        self.blobs = []
+        for _ in range(BLOBS):
+            size = min(5 * 1024 * 1024, int(self.rng.lognormvariate(math.log(200 * 1024), 1.0)))
+            self.blobs.append(storage.put(io.BytesIO(self.rng.randbytes(size))))
+        print(f"✅ {len(self.blobs)} blobs in {type(storage).__name__}")
+
+    def create_documents(self):
+        self.create_blobs()
+        documents = self.writer(Document)
+        for case_id, (attorney, _, opened, assistants) in self.cases:
+            for number in range(lognormal_count(self.rng, DOCUMENTS_PER_CASE)):
+                document_type, extension = self.rng.choice(DOCUMENT_TYPES)
+                blob = self.rng.choice(self.blobs)
+                documents.add({
+                    "name": f"{document_type.lower().replace(' ', '_')}_{number + 1}.{extension}",
+                    "file_path": blob.locator,
+                    "file_type": extension,
+                    "document_type": document_type,
+                    "file_size": blob.size,
+                    "sha256": blob.sha256,
+                    "case_id": case_id,
+                    "uploaded_by_id": self.rng.choice([attorney, *assistants]),
+                    "uploaded_at": moment(self.rng, opened, self.today),
+                })
+        documents.close()
+
+    def create_notes(self):
+        notes = self.writer(Note)
+        for case_id, (attorney, _, opened, assistants) in self.cases:
+            for _ in range(lognormal_count(self.rng, NOTES_PER_CASE)):
+                notes.add({
+                    "content": " ".join(self.rng.choices(NOTE_SENTENCES, k=self.rng.randint(1, 4))),
+                    "case_id": case_id,
+                    "author_id": self.rng.choice([attorney, *assistants]),
+                    "is_pinned": self.rng.random() < 0.03,
+                    "created_at": moment(self.rng, opened, self.today),
+                })
+        notes.close()
+
+    def run(self, password):
+        self.create_users(password)
+        self.create_companies()
+        self.create_clients()
+        self.create_cases()
+        self.create_case_links()
+        self.create_tasks()
+        self.create_documents()
+        self.create_notes()
+        # Fresh planner statistics, so benchmarks see the plans production would
+        self.db.execute(text("ANALYZE"))
+        self.db.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=0.01, help="1 = 200 users, 80k cases, ~2M tasks, ~5M notes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="password", help="password for every generated user")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.email.like(f"%@{EMAIL_DOMAIN}")).first():
+            print(f"❌ This database already has generated (@{EMAIL_DOMAIN}) users")
+            sys.exit(1)
+        print(f"🌱 Generating dataset at scale {args.scale}...")
+        started = time.perf_counter()
+        DatasetGenerator(db, args.scale, args.seed, args.batch_size).run(args.password)
+        print(f"\n🎉 Done in {time.perf_counter() - started:.1f}s")
+        print(f"   Log in as owner1@{EMAIL_DOMAIN}, lawyer1@{EMAIL_DOMAIN} or "
+              f"assistant1@{EMAIL_DOMAIN} with password '{args.password}'")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+Bulk import clients, companies or cases from CSV or NDJSON.
+
+Rows are streamed from the file, validated with the API's schemas and
+inserted in batches (COPY on Postgres). Rows that fail are reported by
+line number without stopping the import.
+
+Cases reference their client by client_id, client_email or client_name,
+their attorney by attorney_email (or primary_attorney_id) and optionally
+one company by company_name (with relationship_type). A case_number
+column keeps existing numbers; otherwise numbers are generated.
+
+Usage:
+    cd backend
+    python import_data.py clients clients.csv
+    python import_data.py cases cases.ndjson [--format ndjson] [--batch-size 5000]
+"""
+
+import argparse
+import sys
+from app.database import SessionLocal
+from app import importer
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import records")
+    parser.add_argument("entity", choices=importer.ENTITIES)
+    parser.add_argument("path", help="CSV or NDJSON file, or - for stdin")
+    parser.add_argument("--format", choices=importer.FORMATS, help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=importer.BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or importer.format_for(args.path)
+    if not fmt:
+        parser.error("cannot tell the format from the file name; pass --format")
+
+    stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8-sig", newline="")
+    db = SessionLocal()
+    try:
+        print(f"📥 Importing {args.entity} from {args.path}...")
+        result = importer.import_stream(db, args.entity, stream, fmt, batch_size=args.batch_size)
+        for error in result.errors:
+            print(f"⚠️  Line {error.row}: {error.error}")
+        if result.failed > len(result.errors):
+            print(f"⚠️  ... and {result.failed - len(result.errors)} more")
+        print(f"✅ Imported {result.inserted} of {result.processed} rows ({result.failed} failed)")
+    finally:
+        db.close()
+        stream.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Migrate existing document files into the content-addressed blob store.
+
+Every document whose file is not yet a blob in the configured backend
+(STORAGE_BACKEND) is hashed and copied into it (or linked to an identical
+blob already there), its row is updated, and the original file is removed
+once no row references it. Duplicates across cases collapse into a single
+file. Running it after switching to STORAGE_BACKEND=s3 moves local files
+into the bucket.
+
+With --gc, blobs no longer referenced by any document are deleted
+afterwards, along with temp files left by interrupted uploads and
+resumable upload sessions that have expired. Deleting a document never
+removes its blob; this is what reclaims the space. Blobs written or
+reused within BLOB_GC_GRACE_SECONDS are kept, as an upload may be about
+to commit a document for them.
+
+Usage:
+    cd backend
+    python relink_documents.py [--dry-run] [--gc]
+"""
+
+import argparse
+import sys
+import time
+from app.database import SessionLocal
+from app.models import Document
+from app import storage, uploads
+
+BATCH_SIZE = 200
+
+def relink(db, dry_run=False):
+    backend = storage.get_storage()
+    linked = deduplicated = missing = 0
+    last_id = 0
+    while True:
+        documents = (
+            db.query(Document)
+            .filter(Document.id > last_id)
+            .order_by(Document.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not documents:
+            break
+        old_paths = []
+        for document in documents:
+            last_id = document.id
+            if document.sha256 and document.file_path == backend.locator_for(document.sha256):
+                continue  # already a blob
+            source_backend = storage.storage_for(document.file_path)
+            if not source_backend.exists(document.file_path):
+                print(f"⚠️  Document {document.id}: file missing at {document.file_path}")
+                missing += 1
+                continue
+            linked += 1
+            if dry_run:
+                continue
+            with source_backend.open(document.file_path) as source:
+                stored = backend.put(source, max_size=sys.maxsize)
+            if not stored.created:
+                deduplicated += 1
+            old_paths.append(document.file_path)
+            document.file_path = stored.locator
+            document.file_size = stored.size
+            document.sha256 = stored.sha256
+        if dry_run:
+            continue
+        db.commit()
+        # Remove originals only once no committed row points at them
+        for old_path in old_paths:
+            still_used = db.query(Document.id).filter(Document.file_path == old_path).first()
+            if not still_used:
+                storage.storage_for(old_path).delete(old_path)
+        db.expunge_all()
+    return linked, deduplicated, missing
+
+def collect_garbage(db, dry_run=False):
+    """Delete blobs that no document references and nothing touched recently"""
+    backend = storage.get_storage()
+    cutoff = time.time() - storage.BLOB_GC_GRACE_SECONDS
+    removed = 0
+    batch = []
+
+    def flush():
+        nonlocal removed
+        digests = [digest for digest, _ in batch]
+        referenced = {
+            row[0] for row in
+            db.query(Document.sha256).filter(Document.sha256.in_(digests)).distinct()
+        }
+        for digest, locator in batch:
+            if digest in referenced:
+                continue
+            # Re-read the timestamp: an upload may have reused the blob
+            # since it was listed
+            modified = backend.modified(locator)
+            if modified is None or modified >= cutoff:
+                continue
+            removed += 1
+            if not dry_run:
+                backend.delete(locator)
+        batch.clear()
+
+    for digest, locator, modified in backend.iter_blobs():
+        if modified >= cutoff:
+            continue
+        batch.append((digest, locator))
+        if len(batch) >= BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+    if not dry_run:
+        backend.remove_stale_temp_files()
+        uploads.remove_stale_sessions()
+    return removed
+
+def main():
+    parser = argparse.ArgumentParser(description="Move document files into the blob store")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without touching anything")
+    parser.add_argument("--gc", action="store_true", help="delete blobs no document references")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print("🔗 Relinking documents...")
+        linked, deduplicated, missing = relink(db, args.dry_run)
+        print(f"✅ Relinked {linked} documents ({deduplicated} deduplicated, {missing} missing files)")
+        if args.gc:
+            removed = collect_garbage(db, args.dry_run)
+            print(f"🗑️  Removed {removed} unreferenced blobs")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
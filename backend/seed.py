@@ -10,7 +10,7 @@ Usage:
 
 from app.database import SessionLocal
 from app.models import User, Client, Case, Task, UserRole, CaseStatus, TaskStatus, TaskPriority
-from app.auth import get_password_hash
+from app.passwords import hash_passwords
 from datetime import date
 
 def seed():
@@ -18,23 +18,24 @@ def seed():
     try:
         print("🌱 Seeding database...")
 
-        # Seed users
+        # Seed users (passwords are hashed in parallel on the shared hashing pool)
+        owner_hash, lawyer_hash, assistant_hash = hash_passwords(["password"] * 3)
         if db.query(User).count() == 0:
             owner = User(
                 email="owner@firm.com",
-                hashed_password=get_password_hash("password"),
+                hashed_password=owner_hash,
                 full_name="John Owner",
                 role=UserRole.OWNER
             )
             lawyer = User(
                 email="lawyer@firm.com",
-                hashed_password=get_password_hash("password"),
+                hashed_password=lawyer_hash,
                 full_name="Jane Lawyer",
                 role=UserRole.LAWYER
             )
             assistant = User(
                 email="assistant@firm.com",
-                hashed_password=get_password_hash("password"),
+                hashed_password=assistant_hash,
                 full_name="Bob Assistant",
                 role=UserRole.ASSISTANT
             )
@@ -45,13 +46,13 @@ def seed():
             # Update existing users with new password hashes
             owner = db.query(User).filter(User.email == "owner@firm.com").first()
             if owner:
-                owner.hashed_password = get_password_hash("password")
+                owner.hashed_password = owner_hash
             lawyer = db.query(User).filter(User.email == "lawyer@firm.com").first()
             if lawyer:
-                lawyer.hashed_password = get_password_hash("password")
+                lawyer.hashed_password = lawyer_hash
             assistant = db.query(User).filter(User.email == "assistant@firm.com").first()
             if assistant:
-                assistant.hashed_password = get_password_hash("password")
+                assistant.hashed_password = assistant_hash
             db.commit()
             print("✅ Updated user passwords")
 
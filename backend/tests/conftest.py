@@ -0,0 +1,111 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+# Run against a throwaway SQLite database unless TEST_DATABASE_URL points
+# elsewhere (e.g. a scratch Postgres). Set before the app is imported, as
+# the engine and storage read their settings at import time.
+_tmp = tempfile.mkdtemp(prefix="casepilot-tests-")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", f"sqlite:///{_tmp}/test.db")
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp, "uploads")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app import models
+from app.auth import create_access_token
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.models import UserRole
+from app.sqlprofile import RequestProfile
+
+@pytest.fixture(scope="session")
+def db_engine():
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+@pytest.fixture(scope="session")
+def dataset(db_engine):
+    """A small firm: one owner, two lawyers, an assistant, 30 cases with
+    tasks and documents, and one case (`case_id`) with many notes. Pages of
+    100 are full."""
+    db = SessionLocal()
+    try:
+        users = {
+            role: models.User(email=f"{role}@tests.example.com", hashed_password="!", full_name=role.title(), role=UserRole(role))
+            for role in ("owner", "lawyer", "assistant")
+        }
+        other_lawyer = models.User(email="lawyer2@tests.example.com", hashed_password="!", full_name="Lawyer 2",
+                                   role=UserRole.LAWYER)
+        db.add_all([*users.values(), other_lawyer])
+        client_row = models.Client(name="Acme Client", email="acme@example.com")
+        db.add(client_row)
+        db.flush()
+
+        cases = []
+        for number in range(30):
+            attorney = users["lawyer"] if number % 3 else other_lawyer
+            case = models.Case(case_number=f"TEST-{number:04d}", title=f"Case {number}", client_id=client_row.id,
+                               primary_attorney_id=attorney.id)
+            db.add(case)
+            cases.append(case)
+        db.flush()
+        for case in cases[:20]:
+            db.add(models.CaseAssistant(case_id=case.id, assistant_id=users["assistant"].id))
+
+        assignees = [users["lawyer"], users["assistant"], other_lawyer, None]
+        for number in range(360):
+            assignee = assignees[number % len(assignees)]
+            db.add(models.Task(title=f"Task {number}", case_id=cases[number % len(cases)].id,
+                               assignee_id=assignee.id if assignee else None, created_by_id=users["owner"].id,
+                               due_date=date.today() + timedelta(days=number % 7)))
+        authors = [users["lawyer"], users["assistant"], users["owner"]]
+        for number in range(150):
+            db.add(models.Note(content=f"Note {number}", case_id=cases[1].id, author_id=authors[number % 3].id,
+                               is_pinned=number % 20 == 0))
+        # One uploader per case, so a lazily loaded uploader costs a query
+        # per distinct row rather than being served from the identity map
+        clerks = [models.User(email=f"clerk{number}@tests.example.com", hashed_password="!",
+                              full_name=f"Clerk {number}", role=UserRole.ASSISTANT) for number in range(len(cases))]
+        db.add_all(clerks)
+        db.flush()
+        for number in range(240):
+            db.add(models.Document(name=f"Document {number}.pdf", file_path=f"uploads/dataset-{number}.pdf",
+                                   file_type="pdf", file_size=1024, case_id=cases[number % len(cases)].id,
+                                   uploaded_by_id=clerks[number % len(clerks)].id))
+        db.commit()
+        return {"case_id": cases[1].id, "emails": {role: user.email for role, user in users.items()}}
+    finally:
+        db.close()
+
+@pytest.fixture
+def client(dataset):
+    return TestClient(app)
+
+@pytest.fixture
+def auth_headers(dataset):
+    def headers(role: str) -> dict:
+        return {"Authorization": f"Bearer {create_access_token({'sub': dataset['emails'][role]})}"}
+    return headers
+
+@pytest.fixture
+def count_statements(db_engine):
+    """Context manager yielding a RequestProfile of the statements run inside it"""
+    @contextmanager
+    def counting():
+        profile = RequestProfile()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            profile.record(statement, 0.0)
+
+        event.listen(db_engine, "before_cursor_execute", record)
+        try:
+            yield profile
+        finally:
+            event.remove(db_engine, "before_cursor_execute", record)
+    return counting
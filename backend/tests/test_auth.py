@@ -0,0 +1,15 @@
+def test_register_then_login(client):
+    account = {"email": "new.hire@tests.example.com", "password": "correct horse", "full_name": "New Hire",
+               "role": "assistant"}
+    registered = client.post("/api/auth/register", json=account)
+    assert registered.status_code == 200, registered.text
+    assert registered.json()["email"] == account["email"]
+    assert client.post("/api/auth/register", json=account).status_code == 400
+
+    wrong = client.post("/api/auth/login", json={"email": account["email"], "password": "wrong"})
+    assert wrong.status_code == 401
+    login = client.post("/api/auth/login", json={"email": account["email"], "password": account["password"]})
+    assert login.status_code == 200
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    me = client.get("/api/auth/me", headers=headers).json()
+    assert me["email"] == account["email"] and me["last_login"]
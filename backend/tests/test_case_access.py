@@ -0,0 +1,27 @@
+from app import models
+from app.database import SessionLocal
+
+def test_revoked_assignment_takes_effect_immediately(client, auth_headers, dataset):
+    """Access is read from the database, so a revocation made by another
+    worker (here: directly in the database) applies to the next request"""
+    case_id = dataset["case_id"]
+    headers = auth_headers("assistant")
+    assert client.get(f"/api/cases/{case_id}", headers=headers).status_code == 200
+
+    db = SessionLocal()
+    try:
+        assignment = db.query(models.CaseAssistant).filter(models.CaseAssistant.case_id == case_id).one()
+        assistant_id = assignment.assistant_id
+        db.delete(assignment)
+        db.commit()
+
+        assert client.get(f"/api/cases/{case_id}", headers=headers).status_code == 403
+        assert client.get(f"/api/notes?case_id={case_id}", headers=headers).status_code == 403
+        listed = client.get("/api/cases", params={"limit": 100}, headers=headers).json()
+        assert case_id not in {case["id"] for case in listed}
+    finally:
+        db.add(models.CaseAssistant(case_id=case_id, assistant_id=assistant_id))
+        db.commit()
+        db.close()
+
+    assert client.get(f"/api/cases/{case_id}", headers=headers).status_code == 200
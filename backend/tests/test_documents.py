@@ -0,0 +1,23 @@
+from starlette.requests import Request
+from app.routers import documents
+
+def test_oversized_upload_is_rejected_before_the_form_is_parsed(client, auth_headers, dataset, monkeypatch):
+    monkeypatch.setattr(documents, "MAX_UPLOAD_SIZE", 1024)
+
+    async def no_form(*args, **kwargs):
+        raise AssertionError("form parsed")
+
+    monkeypatch.setattr(Request, "_get_form", no_form)
+    files = {"file": ("big.bin", b"x" * (1024 + documents.MULTIPART_OVERHEAD + 1), "application/octet-stream")}
+    response = client.post("/api/documents", params={"case_id": dataset["case_id"]}, files=files,
+                           headers=auth_headers("owner"))
+    assert response.status_code == 413
+
+def test_upload_within_limit_is_stored(client, auth_headers, dataset):
+    files = {"file": ("brief.txt", b"Brief", "text/plain")}
+    response = client.post("/api/documents", params={"case_id": dataset["case_id"]}, files=files,
+                           headers=auth_headers("owner"))
+    assert response.status_code == 200, response.text
+    document = response.json()
+    assert (document["name"], document["file_size"]) == ("brief.txt", 5)
+    assert client.delete(f"/api/documents/{document['id']}", headers=auth_headers("owner")).status_code == 200
@@ -0,0 +1,40 @@
+import pytest
+
+def _revalidate(client, url, headers):
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 304
+    return etag
+
+@pytest.mark.parametrize("url", ["/api/tasks/{task_id}", "/api/tasks?limit=10"])
+def test_nested_client_rename_changes_task_etag(client, auth_headers, url):
+    owner = auth_headers("owner")
+    task = client.get("/api/tasks", params={"limit": 1}, headers=owner).json()[0]
+    url = url.format(task_id=task["id"])
+    etag = _revalidate(client, url, owner)
+
+    client_id = task["case"]["client"]["id"]
+    renamed = client.put(f"/api/clients/{client_id}", json={"name": f"Renamed for {url}"}, headers=owner)
+    assert renamed.status_code == 200
+
+    response = client.get(url, headers={**owner, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+def test_nested_user_rename_changes_task_etag(client, auth_headers):
+    """Users have no updated_at; their columns version them"""
+    owner = auth_headers("owner")
+    task = next(
+        task for task in client.get("/api/tasks", params={"limit": 10}, headers=owner).json() if task["assignee"]
+    )
+    url = f"/api/tasks/{task['id']}"
+    etag = _revalidate(client, url, owner)
+
+    assignee = task["assignee"]
+    renamed = client.put(f"/api/users/{assignee['id']}", json={"full_name": assignee["full_name"] + " Jr"}, headers=owner)
+    assert renamed.status_code == 200
+
+    response = client.get(url, headers={**owner, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["assignee"]["full_name"].endswith(" Jr")
@@ -0,0 +1,38 @@
+import io
+import pytest
+from app import importer, models
+from app.database import SessionLocal
+
+def test_empty_and_null_fields_are_left_out():
+    csv_rows = list(importer.iter_records(io.StringIO("title,status,description\nA, ,\n"), "csv"))
+    assert csv_rows == [(2, {"title": "A"})]
+    ndjson_rows = list(importer.iter_records(io.StringIO('{"title": "B", "status": null, "case_type": ""}\n'), "ndjson"))
+    assert ndjson_rows == [(1, {"title": "B"})]
+
+@pytest.mark.parametrize("fmt, content", [
+    ("csv", "case_number,title,client_email,status,description\n"
+            "IMP-CSV-1,Blank status,acme@example.com,,\n"
+            "IMP-CSV-2,Closed case,acme@example.com,closed,Done\n"),
+    ("ndjson", '{"case_number": "IMP-NDJSON-1", "title": "Null status", "client_email": "acme@example.com", "status": null}\n'
+               '{"case_number": "IMP-NDJSON-2", "title": "Closed case", "client_email": "acme@example.com", "status": "closed"}\n'),
+])
+def test_blank_cells_use_schema_defaults(client, auth_headers, fmt, content):
+    files = {"file": (f"cases.{fmt}", content.encode(), "text/plain")}
+    response = client.post("/api/import/cases", files=files, headers=auth_headers("owner"))
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["inserted"], result["failed"]) == (2, 0), result["errors"]
+
+    db = SessionLocal()
+    try:
+        cases = db.query(models.Case).filter(models.Case.case_number.like(f"IMP-{fmt.upper()}-%")).all()
+        statuses = {case.case_number: case.status for case in cases}
+        assert statuses == {
+            f"IMP-{fmt.upper()}-1": models.CaseStatus.OPEN,
+            f"IMP-{fmt.upper()}-2": models.CaseStatus.CLOSED,
+        }
+        for case in cases:
+            db.delete(case)
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,28 @@
+import pytest
+
+# List endpoints load nested rows with a fixed set of eager loads, so the
+# statement count must not grow with the page size (no N+1 queries).
+
+PAGE_SIZES = (10, 100)
+
+@pytest.mark.parametrize("role", ["owner", "lawyer", "assistant"])
+@pytest.mark.parametrize("path", ["/api/tasks", "/api/cases", "/api/notes", "/api/documents"])
+def test_statement_count_is_independent_of_page_size(client, dataset, auth_headers, count_statements, role, path):
+    params = {"case_id": dataset["case_id"]} if path == "/api/notes" else {}
+    headers = auth_headers(role)
+    # Warm the per-process principal cache first, so both measured requests
+    # run the same lookups
+    client.get(path, params={**params, "limit": PAGE_SIZES[0]}, headers=headers)
+
+    counts, profiles, sizes = {}, {}, {}
+    for limit in PAGE_SIZES:
+        with count_statements() as profile:
+            response = client.get(path, params={**params, "limit": limit}, headers=headers)
+        assert response.status_code == 200, response.text
+        counts[limit], profiles[limit], sizes[limit] = profile.statements, profile, len(response.json())
+
+    assert sizes[PAGE_SIZES[0]] == PAGE_SIZES[0]
+    assert sizes[PAGE_SIZES[1]] > PAGE_SIZES[0], "the dataset should fill more than one small page"
+    assert counts[PAGE_SIZES[0]] == counts[PAGE_SIZES[1]], (
+        f"{path} as {role}: {counts} statements; repeated: {profiles[PAGE_SIZES[1]].repeated()}"
+    )
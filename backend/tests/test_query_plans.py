@@ -0,0 +1,99 @@
+"""Query-plan regression tests for the hot list and access-check queries.
+
+The filtered queries issued by get_tasks, get_cases, get_documents,
+get_notes and the case-access lookup are built with the routers' own filter
+code and EXPLAINed; a test fails when one falls back to a sequential scan or
+stops using the index it is meant to use. On Postgres, sequential scans are
+disabled for the check so that small tables still show which indexes are
+usable. Pagination (ORDER BY id LIMIT) is left off: the planner could
+satisfy it by walking the primary key, hiding a missing filter index.
+"""
+
+import json
+import pytest
+from sqlalchemy import text
+from app import models, utils
+from app.database import SessionLocal
+from app.models import UserRole
+from app.routers.cases import filter_cases
+from app.routers.tasks import filter_tasks
+
+# (label, statement builder, table, expected index); builders take the
+# session, the lawyer, the assistant and a case
+CHECKS = [
+    ("case access (attorney)", lambda db, lawyer, assistant, case: utils.case_access_statement(lawyer.id),
+     "cases", "ix_cases_attorney_status"),
+    ("case access (assistant)", lambda db, lawyer, assistant, case: utils.case_access_statement(assistant.id),
+     "case_assistants", "ix_case_assistants_assistant_case"),
+    ("get_tasks as assistant", lambda db, lawyer, assistant, case: filter_tasks(
+        db.query(models.Task), assistant, None, status="todo").statement,
+     "tasks", "ix_tasks_assignee_status_due"),
+    ("get_tasks as lawyer", lambda db, lawyer, assistant, case: filter_tasks(
+        db.query(models.Task), lawyer, utils.accessible_case_ids(lawyer)).statement,
+     "tasks", "ix_tasks_case_id"),
+    ("get_tasks by case", lambda db, lawyer, assistant, case: filter_tasks(
+        db.query(models.Task), lawyer, utils.accessible_case_ids(lawyer), case_id=case.id).statement,
+     "tasks", None),
+    ("get_cases by attorney", lambda db, lawyer, assistant, case: filter_cases(
+        db.query(models.Case), None, status="open", attorney_id=lawyer.id).statement,
+     "cases", "ix_cases_attorney_status"),
+    ("get_documents by case", lambda db, lawyer, assistant, case: db.query(models.Document)
+     .filter(models.Document.case_id == case.id).statement,
+     "documents", "ix_documents_case_id"),
+    ("get_documents as lawyer", lambda db, lawyer, assistant, case: db.query(models.Document)
+     .filter(models.Document.case_id.in_(utils.accessible_case_ids(lawyer))).statement,
+     "documents", "ix_documents_case_id"),
+    ("get_notes", lambda db, lawyer, assistant, case: db.query(models.Note)
+     .filter(models.Note.case_id == case.id)
+     .order_by(models.Note.is_pinned.desc(), models.Note.created_at.desc()).statement,
+     "notes", "ix_notes_case_pinned_created"),
+]
+
+def _pg_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _pg_nodes(child)
+
+def explain(db, statement):
+    """Return (sequentially scanned tables, plan text)"""
+    dialect = db.get_bind().dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "postgresql":
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        nodes = list(_pg_nodes(plan[0]["Plan"]))
+        scanned = {node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"}
+        return scanned, json.dumps(plan)
+    if dialect.name == "sqlite":
+        rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        details = [row[-1] for row in rows]
+        scanned = set()
+        for detail in details:
+            words = detail.split()
+            # "SCAN tasks" is a full scan; "SCAN tasks USING INDEX ..." is not
+            if words[:1] == ["SCAN"] and "INDEX" not in words:
+                scanned.add(words[1])
+        return scanned, "\n".join(details)
+    pytest.skip(f"Query plans are not checked on {dialect.name}")
+
+@pytest.fixture
+def db(dataset):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+@pytest.mark.parametrize("label, build, table, index", CHECKS, ids=[check[0] for check in CHECKS])
+def test_query_uses_index(db, label, build, table, index):
+    lawyer = db.query(models.User).filter(models.User.role == UserRole.LAWYER).first()
+    assistant = db.query(models.User).filter(models.User.role == UserRole.ASSISTANT).first()
+    case = db.query(models.Case).first()
+
+    scanned, plan = explain(db, build(db, lawyer, assistant, case))
+    assert table not in scanned, f"{label}: sequential scan on {table}\n{plan}"
+    if index:
+        assert index in plan, f"{label}: {index} not used\n{plan}"
@@ -0,0 +1,79 @@
+import importlib.util
+from pathlib import Path
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from app import models
+from app.database import SessionLocal
+
+MIGRATION = Path(__file__).resolve().parent.parent / "alembic" / "versions" / "5d2c8e41a7f3_add_full_text_search_indexes.py"
+
+def _run_migration(engine, step: str):
+    spec = importlib.util.spec_from_file_location("fts_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            getattr(migration, step)()
+
+@pytest.fixture
+def search_rows(db_engine, dataset):
+    """The FTS DDL from the migration, plus subpoena cases and notes for the
+    dataset's lawyer and for another lawyer; both removed afterwards"""
+    _run_migration(db_engine, "upgrade")
+    db = SessionLocal()
+    try:
+        lawyer = db.query(models.User).filter(models.User.email == dataset["emails"]["lawyer"]).one()
+        other_lawyer = db.query(models.User).filter(models.User.email == "lawyer2@tests.example.com").one()
+        client_id = db.query(models.Client.id).first().id
+        own_case = models.Case(case_number="FTS-1", title="Subpoena subpoena response",
+                               description="Answer the subpoena", client_id=client_id, primary_attorney_id=lawyer.id)
+        other_case = models.Case(case_number="FTS-2", title="Document review",
+                                 description="Mentions a subpoena once", client_id=client_id,
+                                 primary_attorney_id=other_lawyer.id)
+        db.add_all([own_case, other_case])
+        db.flush()
+        own_note = models.Note(content="Served the subpoena", case_id=own_case.id, author_id=lawyer.id)
+        other_note = models.Note(content="Subpoena draft", case_id=other_case.id, author_id=other_lawyer.id)
+        db.add_all([own_note, other_note])
+        db.commit()
+        rows = {"own_case": own_case.id, "other_case": other_case.id, "own_note": own_note.id, "other_note": other_note.id}
+        yield rows
+        db.query(models.Note).filter(models.Note.id.in_([own_note.id, other_note.id])).delete(synchronize_session=False)
+        db.query(models.Case).filter(models.Case.id.in_([own_case.id, other_case.id])).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+        _run_migration(db_engine, "downgrade")
+
+def _hits(response):
+    assert response.status_code == 200, response.text
+    return [(hit["type"], hit["id"]) for hit in response.json()]
+
+def test_search_ranks_hits(client, auth_headers, search_rows):
+    results = client.get("/api/search", params={"q": "subpoena"}, headers=auth_headers("owner")).json()
+    ranks = [hit["rank"] for hit in results]
+    assert ranks == sorted(ranks, reverse=True)
+    cases = [hit["id"] for hit in results if hit["type"] == "case"]
+    # Three mentions outrank one
+    assert cases == [search_rows["own_case"], search_rows["other_case"]]
+    assert {hit["id"] for hit in results if hit["type"] == "note"} == {search_rows["own_note"], search_rows["other_note"]}
+
+def test_search_hides_other_lawyers_cases_and_notes(client, auth_headers, search_rows):
+    hits = _hits(client.get("/api/search", params={"q": "subpoena"}, headers=auth_headers("lawyer")))
+    assert ("case", search_rows["own_case"]) in hits
+    assert ("note", search_rows["own_note"]) in hits
+    assert ("case", search_rows["other_case"]) not in hits
+    assert ("note", search_rows["other_note"]) not in hits
+
+def test_search_types_filter(client, auth_headers, search_rows):
+    hits = _hits(client.get("/api/search", params={"q": "subpoena", "types": "note"}, headers=auth_headers("owner")))
+    assert hits and {kind for kind, _ in hits} == {"note"}
+    response = client.get("/api/search", params={"q": "subpoena", "types": "note,matter"}, headers=auth_headers("owner"))
+    assert response.status_code == 400
+
+def test_search_without_index_is_unavailable(client, auth_headers, db_engine):
+    if db_engine.dialect.name != "sqlite":
+        pytest.skip("Postgres answers without its GIN indexes")
+    response = client.get("/api/search", params={"q": "acme"}, headers=auth_headers("owner"))
+    assert response.status_code == 503
@@ -0,0 +1,36 @@
+import pytest
+from app import uploads
+
+@pytest.fixture
+def session_id(client, auth_headers, dataset):
+    response = client.post("/api/uploads", json={"case_id": dataset["case_id"], "filename": "scan.pdf", "size": 10},
+                           headers=auth_headers("owner"))
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+def test_chunks_complete_into_a_document(client, auth_headers, session_id):
+    owner = auth_headers("owner")
+    response = client.put(f"/api/uploads/{session_id}/chunks/0", content=b"0123456789", headers=owner)
+    assert response.json() == {"index": 0, "size": 10}
+    assert client.get(f"/api/uploads/{session_id}", headers=owner).json()["received"] == [0]
+
+    document = client.post(f"/api/uploads/{session_id}/complete", headers=owner).json()
+    assert (document["name"], document["file_size"]) == ("scan.pdf", 10)
+    assert client.delete(f"/api/documents/{document['id']}", headers=owner).status_code == 200
+
+def test_chunk_racing_a_completion_is_not_found(client, auth_headers, session_id, monkeypatch):
+    claimed = []
+    open_chunk = uploads.UploadSession.open_chunk
+
+    def claim_then_open(session):
+        # The completion claims the session after the PUT has looked it up
+        claimed.append(uploads.claim_session(session))
+        return open_chunk(session)
+
+    monkeypatch.setattr(uploads.UploadSession, "open_chunk", claim_then_open)
+    try:
+        response = client.put(f"/api/uploads/{session_id}/chunks/0", content=b"0123456789",
+                              headers=auth_headers("owner"))
+        assert response.status_code == 404
+    finally:
+        uploads.remove_session(claimed[0])